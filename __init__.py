@@ -50,7 +50,12 @@ def is_version_compatible(save_version):
 w = ui.window.Window()
 
 try:
-    game = persistency.restore_game()
+    # header is checked first so an incompatible save is not loaded at all
+    header = persistency.restore_header()
+    game = None
+    if header and (header.is_legacy or is_version_compatible(header.game_version)):
+        game = persistency.restore_game()
+
     if not game or not is_version_compatible(game.settings.version):
         ui.newgamemenu.NewGameMenu(w, w.start_new_game).display()
     else:
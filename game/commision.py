@@ -0,0 +1,136 @@
+import heapq
+import logging
+import math
+import typing
+
+from dcs.task import *
+from dcs.unittype import UnitType
+from dcs.vehicles import AirDefence
+
+from theater import *
+from theater.inventory import InventoryMatrix
+
+from . import db
+from .rng import STREAM_COMMISION
+
+COMMISION_UNIT_VARIETY = 4
+COMMISION_LIMITS_SCALE = 1.5
+COMMISION_LIMITS_FACTORS = {
+    PinpointStrike: 10,
+    CAS: 5,
+    CAP: 8,
+    AirDefence: 1,
+}
+
+COMMISION_AMOUNTS_SCALE = 1.5
+COMMISION_AMOUNTS_FACTORS = {
+    PinpointStrike: 3,
+    CAS: 1,
+    CAP: 2,
+    AirDefence: 0.3,
+}
+
+COMMISION_TASKS = [PinpointStrike, CAS, CAP, AirDefence]
+
+# commision points available per turn for each control point, spent on the largest deficits first
+COMMISION_BUDGET_PER_CP = 6
+
+
+class CommisionOrder:
+    cp = None  # type: ControlPoint
+    task = None  # type: Task
+    deficit = 0  # type: float
+    priority = 0  # type: float
+    awarded_points = 0  # type: float
+    points = 0  # type: int
+    unit_type = None  # type: UnitType
+
+    def __init__(self, cp: ControlPoint, task: Task, deficit: float):
+        self.cp = cp
+        self.task = task
+        self.deficit = deficit
+        self.priority = deficit * cp.importance
+        self.awarded_points = 0
+        self.points = 0
+        self.unit_type = None
+
+    def __str__(self):
+        return "{} {}: deficit {:.2f}, priority {:.2f}, {} x {}".format(
+            self.cp,
+            db.task_name(self.task),
+            self.deficit,
+            self.priority,
+            self.points,
+            self.unit_type and db.unit_type_name(self.unit_type))
+
+
+class CommisionPlanner:
+    """
+    Evaluates unit deficits of all the given control points at once and spends the turn commision budget on them
+    in the order of importance-weighted deficit. `plan` has no side effects: it only computes the orders, including
+    the points awarded and units each would yield. `commit` adds the awarded points to the bases, picks unit types
+    and commisions the units.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self._unit_types = {}  # type: typing.Dict[typing.Tuple[float, Task], typing.Collection[UnitType]]
+
+    def unit_types(self, cp: ControlPoint, task: Task) -> typing.Collection[UnitType]:
+        # unit choice only depends on importance, so it is shared by control points of the same importance
+        key = cp.importance, task
+        if key not in self._unit_types:
+            self._unit_types[key] = self.game.commision_unit_types(cp, task)
+
+        return self._unit_types[key]
+
+    def deficits(self, cps: typing.Collection[ControlPoint]) -> typing.List[CommisionOrder]:
+        multiplier = self.game.settings.multiplier
+
+        matrix = InventoryMatrix(cps)
+        totals = {task: matrix.total_units_per_cp(task) for task in COMMISION_TASKS}
+
+        orders = []
+        for cp in cps:
+            limit_scale = math.pow(cp.importance, COMMISION_LIMITS_SCALE) * multiplier
+            for task in COMMISION_TASKS:
+                deficit = COMMISION_LIMITS_FACTORS[task] * limit_scale - totals[task][cp]
+                if deficit > 0:
+                    orders.append(CommisionOrder(cp, task, deficit))
+
+        return orders
+
+    def budget(self, cps: typing.Collection[ControlPoint]) -> float:
+        return COMMISION_BUDGET_PER_CP * len(cps) * self.game.settings.multiplier
+
+    def plan(self, cps: typing.Collection[ControlPoint], budget: float = None) -> typing.List[CommisionOrder]:
+        multiplier = self.game.settings.multiplier
+        if budget is None:
+            budget = self.budget(cps)
+
+        queue = [(-order.priority, idx, order) for idx, order in enumerate(self.deficits(cps))]
+        heapq.heapify(queue)
+
+        batch = []
+        while queue:
+            _, _, order = heapq.heappop(queue)
+            amount = COMMISION_AMOUNTS_FACTORS[order.task] * math.pow(order.cp.importance, COMMISION_AMOUNTS_SCALE) * multiplier
+            order.awarded_points = min(amount, budget)
+            budget -= order.awarded_points
+            # same amount base.append_commision_points will return on commit
+            order.points = int(math.floor(order.cp.base.commision_points.get(order.task, 0) + order.awarded_points))
+            batch.append(order)
+
+        return batch
+
+    def commit(self, batch: typing.Collection[CommisionOrder]):
+        rng = self.game.rng.stream(STREAM_COMMISION)
+        for order in batch:
+            points = order.cp.base.append_commision_points(order.task, order.awarded_points)
+            assert points == order.points, "commision points changed after planning"
+            if points <= 0:
+                continue
+
+            order.unit_type = rng.choice(self.unit_types(order.cp, order.task))
+            logging.info("Commision {}".format(order))
+            order.cp.base.commision_units({order.unit_type: order.points})
@@ -1,5 +1,7 @@
 import typing
+import types
 import enum
+import math
 
 from dcs.vehicles import *
 from dcs.ships import *
@@ -451,15 +453,18 @@ StartingPosition = typing.Optional[typing.Union[ShipGroup, StaticGroup, Airport,
 
 
 def unit_task(unit: UnitType) -> Task:
-    for task, units in UNIT_BY_TASK.items():
-        if unit in units:
-            return task
+    task = TASK_BY_UNIT.get(unit)
+    assert task is not None, "{} not in tasks".format(unit)
+    return task
 
-    assert False
+
+def unit_countries(unit: UnitType) -> typing.FrozenSet[str]:
+    return COUNTRIES_BY_UNIT.get(unit, frozenset())
 
 
 def find_unittype(for_task: Task, country_name: str) -> typing.List[UnitType]:
-    return [x for x in UNIT_BY_TASK[for_task] if x in UNIT_BY_COUNTRY[country_name]]
+    country_units = UNITS_OF_COUNTRY[country_name]
+    return [x for x in UNIT_BY_TASK[for_task] if x in country_units]
 
 
 def unit_type_name(unit_type) -> str:
@@ -467,23 +472,20 @@ def unit_type_name(unit_type) -> str:
 
 
 def unit_type_from_name(name: str) -> UnitType:
-    if name in vehicle_map:
-        return vehicle_map[name]
-    elif name in plane_map:
-        return plane_map[name]
-    elif name in ship_map:
-        return ship_map[name]
-    else:
-        return None
+    return UNIT_TYPE_BY_NAME.get(name)
 
 
 def unit_type_of(unit: Unit) -> UnitType:
-    if isinstance(unit, Vehicle):
-        return vehicle_map[unit.type]
-    elif isinstance(unit, Ship):
-        return ship_map[unit.type]
-    else:
-        return unit.unit_type
+    unit_map = _UNIT_MAP_BY_CLASS.get(unit.__class__)
+    if unit_map is None:
+        if isinstance(unit, Vehicle):
+            unit_map = vehicle_map
+        elif isinstance(unit, Ship):
+            unit_map = ship_map
+        else:
+            return unit.unit_type
+
+    return unit_map[unit.type]
 
 
 def task_name(task) -> str:
@@ -505,7 +507,8 @@ def choose_units(for_task: Task, factor: float, count: int, country: str) -> typ
 
     index_start = min(idx, len(suitable_unittypes) - variety)
     index_end = min(idx + variety, len(suitable_unittypes))
-    return list(set(suitable_unittypes[index_start:index_end]))
+    # dict keeps the order stable between runs, unlike set
+    return list(dict.fromkeys(suitable_unittypes[index_start:index_end]))
 
 
 def unitdict_append(unit_dict: UnitsDict, unit_type: UnitType, count: int):
@@ -520,14 +523,26 @@ def unitdict_merge(a: UnitsDict, b: UnitsDict) -> UnitsDict:
     return b
 
 
+def _split_chunk_size(count) -> int:
+    # chunk is yielded as soon as it reaches count, but always holds at least one unit
+    return max(int(math.ceil(count)), 1)
+
+
 def unitdict_split(unit_dict: UnitsDict, count: int):
+    chunk_size = _split_chunk_size(count)
     buffer_dict = {}
+    buffer_count = 0
     for unit_type, unit_count in unit_dict.items():
-        for _ in range(unit_count):
-            unitdict_append(buffer_dict, unit_type, 1)
-            if sum(buffer_dict.values()) >= count:
+        while unit_count > 0:
+            amount = min(unit_count, chunk_size - buffer_count)
+            buffer_dict[unit_type] = buffer_dict.get(unit_type, 0) + amount
+            buffer_count += amount
+            unit_count -= amount
+
+            if buffer_count >= chunk_size:
                 yield buffer_dict
                 buffer_dict = {}
+                buffer_count = 0
 
     if len(buffer_dict):
         yield buffer_dict
@@ -537,11 +552,7 @@ def unitdict_restrict_count(unit_dict: UnitsDict, total_count: int) -> UnitsDict
     if total_count == 0:
         return {}
 
-    groups = list(unitdict_split(unit_dict, total_count))
-    if len(groups) > 0:
-        return groups[0]
-    else:
-        return {}
+    return next(unitdict_split(unit_dict, total_count), {})
 
 
 def assigned_units_split(fd: AssignedUnitsDict) -> typing.Tuple[PlaneDict, PlaneDict]:
@@ -553,19 +564,18 @@ def assigned_units_from(d: PlaneDict) -> AssignedUnitsDict:
 
 
 def assignedunits_split_to_count(dict: AssignedUnitsDict, count: int):
+    # chunks are limited per unit type, units of other types already in the buffer are carried along
+    chunk_size = _split_chunk_size(count)
     buffer_dict = {}
     for unit_type, (unit_count, client_count) in dict.items():
-        for _ in range(unit_count):
-            new_count, new_client_count = buffer_dict.get(unit_type, (0, 0))
-
-            new_count += 1
-
-            if client_count > 0:
-                new_client_count += 1
-                client_count -= 1
-
-            buffer_dict[unit_type] = new_count, new_client_count
-            if new_count >= count:
+        while unit_count > 0:
+            amount = min(unit_count, chunk_size)
+            client_amount = min(max(client_count, 0), amount)
+            buffer_dict[unit_type] = amount, client_amount
+            unit_count -= amount
+            client_count -= client_amount
+
+            if amount >= chunk_size:
                 yield buffer_dict
                 buffer_dict = {}
 
@@ -586,12 +596,12 @@ def _validate_db():
             total_set.add(unit_type)
 
     # check country allegiance
+    country_set = set()
+    for country_units_list in UNIT_BY_COUNTRY.values():
+        country_set.update(country_units_list)
+
     for unit_type in total_set:
-        did_find = False
-        for country_units_list in UNIT_BY_COUNTRY.values():
-            if unit_type in country_units_list:
-                did_find = True
-        assert did_find, "{} not in country list".format(unit_type)
+        assert unit_type in country_set, "{} not in country list".format(unit_type)
 
     # check prices
     for unit_type in total_set:
@@ -599,3 +609,72 @@ def _validate_db():
 
 
 _validate_db()
+
+"""
+Reverse lookup indexes, built once at import from the tables above
+"""
+
+
+def _build_indexes():
+    task_by_unit = {}
+    for task, unit_collection in UNIT_BY_TASK.items():
+        for unit_type in unit_collection:
+            task_by_unit[unit_type] = task
+
+    countries_by_unit = {}
+    for country, unit_collection in UNIT_BY_COUNTRY.items():
+        for unit_type in unit_collection:
+            countries_by_unit.setdefault(unit_type, set()).add(country)
+
+    # vehicles take precedence over planes and planes over ships on name collision
+    unit_type_by_name = {}
+    for unit_map in [ship_map, plane_map, vehicle_map]:
+        unit_type_by_name.update(unit_map)
+
+    return (
+        types.MappingProxyType(task_by_unit),
+        types.MappingProxyType({task: frozenset(units) for task, units in UNIT_BY_TASK.items()}),
+        types.MappingProxyType({unit_type: frozenset(countries) for unit_type, countries in countries_by_unit.items()}),
+        types.MappingProxyType({country: frozenset(units) for country, units in UNIT_BY_COUNTRY.items()}),
+        types.MappingProxyType(unit_type_by_name),
+    )
+
+
+TASK_BY_UNIT, UNITS_OF_TASK, COUNTRIES_BY_UNIT, UNITS_OF_COUNTRY, UNIT_TYPE_BY_NAME = _build_indexes()
+_UNIT_MAP_BY_CLASS = {
+    Vehicle: vehicle_map,
+    Ship: ship_map,
+}
+
+
+def _build_catalog():
+    catalog = []
+    for unit_collection in UNIT_BY_TASK.values():
+        for unit_type in unit_collection:
+            if unit_type not in catalog:
+                catalog.append(unit_type)
+
+    unit_id_by_type = {unit_type: unit_id for unit_id, unit_type in enumerate(catalog)}
+    # grouped by TASK_BY_UNIT, same as the Base task totals
+    unit_ids_of_task = {task: tuple(sorted(unit_id_by_type[x] for x, x_task in TASK_BY_UNIT.items() if x_task == task)) for task in UNIT_BY_TASK.keys()}
+
+    return (
+        tuple(catalog),
+        tuple(unit_type_name(x) for x in catalog),
+        types.MappingProxyType(unit_id_by_type),
+        types.MappingProxyType(unit_ids_of_task),
+    )
+
+
+"""
+Dense unit ids: position of the unit type in UNIT_CATALOG. Used by array-backed inventories.
+"""
+UNIT_CATALOG, UNIT_CATALOG_NAMES, UNIT_ID_BY_TYPE, UNIT_IDS_OF_TASK = _build_catalog()
+
+"""
+Unit types of each task, most expensive first (ties by unit id). Used to pick the best available units without per-call sorting.
+"""
+PRICE_RANKING_OF_TASK = types.MappingProxyType({
+    task: tuple(sorted(set(units), key=lambda x: (-PRICES[x], UNIT_ID_BY_TYPE[x])))
+    for task, units in UNIT_BY_TASK.items()
+})
@@ -38,8 +38,8 @@ class BaseAttackEvent(Event):
         if self.is_successfull(debriefing):
             if self.departure_cp.captured:
                 self.to_cp.captured = True
-                self.to_cp.ground_objects = []
-                self.to_cp.base.filter_units(db.UNIT_BY_COUNTRY[self.attacker_name])
+                self.game.theater.clear_ground_objects(self.to_cp)
+                self.to_cp.base.filter_units(db.UNITS_OF_COUNTRY[self.attacker_name])
 
             self.to_cp.base.affect_strength(+self.STRENGTH_RECOVERY)
         else:
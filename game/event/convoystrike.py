@@ -68,7 +68,7 @@ class ConvoyStrikeEvent(Event):
         defense_unittype = db.find_unittype(PinpointStrike, self.defender_name)[0]
 
         defenders_count = int(math.ceil(self.from_cp.base.strength * self.from_cp.importance * DEFENDERS_AMOUNT_FACTOR))
-        self.targets = {convoy_unittype: random.randrange(*TRANSPORT_COUNT),
+        self.targets = {convoy_unittype: self.game.rng.stream(STREAM_EVENTS).randrange(*TRANSPORT_COUNT),
                         defense_unittype: defenders_count, }
 
         op = ConvoyStrikeOperation(game=self.game,
@@ -11,6 +11,7 @@ from theater import *
 from gen.environmentgen import EnvironmentSettings
 from gen.conflictgen import Conflict
 from game.db import assigned_units_from, unitdict_from
+from game.rng import STREAM_EVENTS, STREAM_PLACEMENT
 
 from userdata.debriefing import Debriefing
 from userdata import persistency
@@ -45,6 +46,12 @@ class Event:
         self.attacker_name = attacker_name
         self.defender_name = defender_name
 
+    def __getstate__(self):
+        # operation is only valid for the turn it was generated in
+        state = self.__dict__.copy()
+        state.pop("operation", None)
+        return state
+
     @property
     def is_player_attacking(self) -> bool:
         return self.attacker_name == self.game.player
@@ -117,6 +124,7 @@ class Event:
         self.operation.generate()
         self.operation.current_mission.save(persistency.mission_path_for("liberation_nextturn.miz"))
         self.environment_settings = self.operation.environment_settings
+        self.operation.release_mission()
 
     def generate_quick(self):
         self.operation.is_awacs_enabled = self.is_awacs_enabled
@@ -125,6 +133,7 @@ class Event:
         self.operation.prepare(self.game.theater.terrain, is_quick=True)
         self.operation.generate()
         self.operation.current_mission.save(persistency.mission_path_for("liberation_nextturn_quick.miz"))
+        self.operation.release_mission()
 
     def commit(self, debriefing: Debriefing):
         for country, losses in debriefing.destroyed_units.items():
@@ -137,17 +146,10 @@ class Event:
             cp.base.commit_losses(losses)
 
         for object_identifier in debriefing.destroyed_objects:
-            for cp in self.game.theater.controlpoints:
-                if not cp.ground_objects:
-                    continue
-
-                for i, ground_object in enumerate(cp.ground_objects):
-                    if ground_object.is_dead:
-                        continue
-
-                    if ground_object.matches_string_identifier(object_identifier):
-                        logging.info("cp {} killing ground object {}".format(cp, ground_object.string_identifier))
-                        cp.ground_objects[i].is_dead = True
+            # every alive object with the identifier dies, units of a group can share one
+            for ground_object in self.game.theater.find_ground_objects(object_identifier):
+                logging.info("cp {} killing ground object {}".format(ground_object.cp_id, ground_object.string_identifier))
+                self.game.theater.kill_ground_object(ground_object)
 
     def skip(self):
         pass
@@ -13,7 +13,7 @@ class InterceptEvent(Event):
     def __init__(self, game, from_cp: ControlPoint, target_cp: ControlPoint, location: Point, attacker_name: str,
                  defender_name: str):
         super().__init__(game, from_cp, target_cp, location, attacker_name, defender_name)
-        self.location = Conflict.intercept_position(self.from_cp, self.to_cp)
+        self.location = Conflict.intercept_position(self.from_cp, self.to_cp, game.rng.stream(STREAM_PLACEMENT))
 
     def __str__(self):
         return "Air Intercept"
@@ -73,7 +73,7 @@ class InterceptEvent(Event):
 
         escort = self.to_cp.base.scramble_sweep(self._enemy_scramble_multiplier())
 
-        self.transport_unit = random.choice(db.find_unittype(Transport, self.defender_name))
+        self.transport_unit = self.game.rng.stream(STREAM_EVENTS).choice(db.find_unittype(Transport, self.defender_name))
         assert self.transport_unit is not None
 
         airdefense_unit = db.find_unittype(AirDefence, self.defender_name)[-1]
@@ -97,7 +97,7 @@ class InterceptEvent(Event):
 
         interceptors = self.from_cp.base.scramble_interceptors(self.game.settings.multiplier)
 
-        self.transport_unit = random.choice(db.find_unittype(Transport, self.defender_name))
+        self.transport_unit = self.game.rng.stream(STREAM_EVENTS).choice(db.find_unittype(Transport, self.defender_name))
         assert self.transport_unit is not None
 
         op = InterceptOperation(game=self.game,
@@ -12,7 +12,7 @@ class NavalInterceptEvent(Event):
     def __init__(self, game, from_cp: ControlPoint, target_cp: ControlPoint, location: Point, attacker_name: str,
                  defender_name: str):
         super().__init__(game, from_cp, target_cp, location, attacker_name, defender_name)
-        self.location = Conflict.naval_intercept_position(from_cp, target_cp, game.theater)
+        self.location = Conflict.naval_intercept_position(from_cp, target_cp, game.theater, game.rng.stream(STREAM_PLACEMENT))
 
     def _targets_count(self) -> int:
         from gen.conflictgen import IMPORTANCE_LOW
@@ -81,7 +81,7 @@ class NavalInterceptEvent(Event):
         assert CAS in flights and len(flights) == 1, "Invalid flights"
 
         self.targets = {
-            random.choice(db.find_unittype(CargoTransportation, self.defender_name)): self._targets_count(),
+            self.game.rng.stream(STREAM_EVENTS).choice(db.find_unittype(CargoTransportation, self.defender_name)): self._targets_count(),
         }
 
         op = NavalInterceptionOperation(
@@ -104,7 +104,7 @@ class NavalInterceptEvent(Event):
         assert CAP in flights and len(flights) == 1, "Invalid flights"
 
         self.targets = {
-            random.choice(db.find_unittype(CargoTransportation, self.defender_name)): self._targets_count(),
+            self.game.rng.stream(STREAM_EVENTS).choice(db.find_unittype(CargoTransportation, self.defender_name)): self._targets_count(),
         }
 
         op = NavalInterceptionOperation(
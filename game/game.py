@@ -2,6 +2,7 @@ import logging
 import typing
 import random
 import math
+import uuid
 
 from dcs.task import *
 from dcs.vehicles import *
@@ -12,25 +13,10 @@ from theater import *
 
 from . import db
 from .settings import Settings
+from .rng import RandomService, STREAM_EVENTS
+from .commision import *
 from .event import *
 
-COMMISION_UNIT_VARIETY = 4
-COMMISION_LIMITS_SCALE = 1.5
-COMMISION_LIMITS_FACTORS = {
-    PinpointStrike: 10,
-    CAS: 5,
-    CAP: 8,
-    AirDefence: 1,
-}
-
-COMMISION_AMOUNTS_SCALE = 1.5
-COMMISION_AMOUNTS_FACTORS = {
-    PinpointStrike: 3,
-    CAS: 1,
-    CAP: 2,
-    AirDefence: 0.3,
-}
-
 PLAYER_INTERCEPT_GLOBAL_PROBABILITY_BASE = 30
 PLAYER_INTERCEPT_GLOBAL_PROBABILITY_LOG = 2
 PLAYER_BASEATTACK_THRESHOLD = 0.4
@@ -88,23 +74,38 @@ PLAYER_BUDGET_IMPORTANCE_LOG = 2
 class Game:
     settings = None  # type: Settings
     budget = PLAYER_BUDGET_INITIAL
+    turn = 0
     events = None  # type: typing.List[Event]
     pending_transfers = None  # type: typing.Dict[]
     ignored_cps = None  # type: typing.Collection[ControlPoint]
+    rng = None  # type: RandomService
+    campaign_id = None  # type: str
 
-    def __init__(self, player_name: str, enemy_name: str, theater: ConflictTheater):
+    def __init__(self, player_name: str, enemy_name: str, theater: ConflictTheater, rng: RandomService = None):
         self.settings = Settings()
         self.events = []
         self.theater = theater
         self.player = player_name
         self.enemy = enemy_name
+        self.rng = rng or RandomService()
+        self.campaign_id = uuid.uuid4().hex
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.rng is None:
+            # saves made before the campaign owned its random service
+            self.rng = RandomService()
+
+        if self.campaign_id is None:
+            # saves made before campaigns had an id; seed is campaign specific and saved, so the id stays the same
+            self.campaign_id = "{:016x}".format(self.rng.seed)
 
     def _roll(self, prob, mult):
         if self.settings.version == "dev":
             # always generate all events for dev
             return 100
         else:
-            return random.randint(1, 100) <= prob * mult
+            return self.rng.stream(STREAM_EVENTS).randint(1, 100) <= prob * mult
 
     def _generate_player_event(self, event_class, player_cp, enemy_cp):
         if event_class == NavalInterceptEvent and enemy_cp.radials == LAND:
@@ -198,18 +199,9 @@ class Game:
         else:
             return db.choose_units(for_task, importance_factor, COMMISION_UNIT_VARIETY, self.enemy)
 
-    def _commision_units(self, cp: ControlPoint):
-        for for_task in [PinpointStrike, CAS, CAP, AirDefence]:
-            limit = COMMISION_LIMITS_FACTORS[for_task] * math.pow(cp.importance, COMMISION_LIMITS_SCALE) * self.settings.multiplier
-            missing_units = limit - cp.base.total_units(for_task)
-            if missing_units > 0:
-                awarded_points = COMMISION_AMOUNTS_FACTORS[for_task] * math.pow(cp.importance, COMMISION_AMOUNTS_SCALE) * self.settings.multiplier
-                points_to_spend = cp.base.append_commision_points(for_task, awarded_points)
-                if points_to_spend > 0:
-                    unittypes = self.commision_unit_types(cp, for_task)
-                    d = {random.choice(unittypes): points_to_spend}
-                    logging.info("Commision {}: {}".format(cp, d))
-                    cp.base.commision_units(d)
+    def _commision_units(self, cps: typing.Collection[ControlPoint]):
+        planner = CommisionPlanner(self)
+        planner.commit(planner.plan(cps))
 
     @property
     def budget_reward_amount(self):
@@ -273,11 +265,11 @@ class Game:
             else:
                 event.skip()
 
+        self.turn += 1
         if not no_action:
             self._budget_player()
 
-            for cp in self.theater.enemy_points():
-                self._commision_units(cp)
+            self._commision_units(self.theater.enemy_points())
 
             for cp in self.theater.player_points():
                 cp.base.affect_strength(+PLAYER_BASE_STRENGTH_RECOVERY)
@@ -21,7 +21,8 @@ class InsurgentAttackOperation(Operation):
             defender=self.current_mission.country(self.defender_name),
             from_cp=self.from_cp,
             to_cp=self.to_cp,
-            theater=self.game.theater
+            theater=self.game.theater,
+            rng=self.game.rng.stream(STREAM_PLACEMENT)
         )
 
         self.initialize(mission=self.current_mission,
@@ -36,7 +36,8 @@ class InterceptOperation(Operation):
             position=self.location,
             from_cp=self.from_cp,
             to_cp=self.to_cp,
-            theater=self.game.theater
+            theater=self.game.theater,
+            rng=self.game.rng.stream(STREAM_PLACEMENT)
         )
 
         self.initialize(mission=self.current_mission,
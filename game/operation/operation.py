@@ -1,5 +1,7 @@
 from dcs.lua.parse import loads
 
+from game.rng import STREAM_PLACEMENT
+
 from userdata.debriefing import *
 
 from gen import *
@@ -14,6 +16,9 @@ class Operation:
     current_mission = None  # type: dcs.Mission
     regular_mission = None  # type: dcs.Mission
     quick_mission = None  # type: dcs.Mission
+    regular_manifest = None  # type: MissionManifest
+    quick_manifest = None  # type: MissionManifest
+    last_manifest = None  # type: MissionManifest
     conflict = None  # type: Conflict
     armorgen = None  # type: ArmorConflictGenerator
     airgen = None  # type: AircraftConflictGenerator
@@ -62,9 +67,9 @@ class Operation:
     def initialize(self, mission: Mission, conflict: Conflict):
         self.current_mission = mission
         self.conflict = conflict
-        self.armorgen = ArmorConflictGenerator(mission, conflict)
-        self.airgen = AircraftConflictGenerator(mission, conflict, self.game.settings)
-        self.aagen = AAConflictGenerator(mission, conflict)
+        self.armorgen = ArmorConflictGenerator(mission, conflict, self.game.rng.stream(STREAM_PLACEMENT))
+        self.airgen = AircraftConflictGenerator(mission, conflict, self.game.settings, self.game.rng.stream(STREAM_PLACEMENT))
+        self.aagen = AAConflictGenerator(mission, conflict, self.game.rng.stream(STREAM_PLACEMENT))
         self.shipgen = ShipGenerator(mission, conflict)
         self.airsupportgen = AirSupportConflictGenerator(mission, conflict, self.game)
         self.triggersgen = TriggersGenerator(mission, conflict, self.game)
@@ -78,6 +83,26 @@ class Operation:
         enemy_name = self.from_cp.captured and self.defender_name or self.attacker_name
         self.extra_aagen = ExtraAAConflictGenerator(mission, conflict, self.game, player_name, enemy_name)
 
+    def release_mission(self):
+        """
+        Replaces the generated mission with its unit manifest and drops the generators referencing it.
+        Should be called once the mission is saved.
+        """
+        manifest = MissionManifest(self.current_mission, [self.attacker_name, self.defender_name])
+        # is_quick can't be used here, since some operations toggle it while generating
+        if self.current_mission is self.quick_mission:
+            self.quick_manifest = manifest
+        else:
+            self.regular_manifest = manifest
+        self.last_manifest = manifest
+
+        self.current_mission = self.regular_mission = self.quick_mission = None
+        self.conflict = None
+        self.attackers_starting_position = self.defenders_starting_position = None
+        for generator in ["armorgen", "airgen", "aagen", "extra_aagen", "shipgen", "triggersgen", "airsupportgen",
+                          "visualgen", "envgen", "groundobjectgen", "briefinggen", "forcedoptionsgen"]:
+            setattr(self, generator, None)
+
     def prepare(self, terrain: Terrain, is_quick: bool):
         with open("resources/default_options.lua", "r") as f:
             options_dict = loads(f.read())["options"]
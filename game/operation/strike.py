@@ -42,37 +42,21 @@ class StrikeOperation(Operation):
     def generate(self):
         self.prepare_carriers(db.unitdict_merge(db.unitdict_from(self.strikegroup), db.unitdict_from(self.escort)))
 
-        targets = []  # type: typing.List[typing.Tuple[str, str, Point]]
-        sead_targets = []  # type: typing.List[typing.Tuple[str, str, Point]]
-        category_counters = {}  # type: typing.Dict[str, int]
-        processed_groups = []
+        from_position = self.from_cp.position
+        targets = sorted(self.to_cp.strike_target_groups,
+                         key=lambda x: (x.position.x - from_position.x) ** 2 + (x.position.y - from_position.y) ** 2)
+        sead_targets = [x for x in targets if x.is_aa]
 
-        for object in self.to_cp.ground_objects:
-            if object.group_identifier in processed_groups:
-                continue
-
-            processed_groups.append(object.group_identifier)
-            category_counters[object.category] = category_counters.get(object.category, 0) + 1
-            markpoint_name = "{}{}".format(object.name_abbrev, category_counters[object.category])
-
-            if object.category == "aa":
-                sead_targets.append((str(object), markpoint_name, object.position))
-
-            targets.append((str(object), markpoint_name, object.position))
-
-        targets.sort(key=lambda x: self.from_cp.position.distance_to_point(x[2]))
-
-        for (name, markpoint_name, _) in targets:
-            self.briefinggen.append_waypoint("TARGET {} (TP {})".format(str(name), markpoint_name))
+        self.briefinggen.append_target_groups(targets)
 
         planes_flights = {k: v for k, v in self.strikegroup.items() if k in plane_map.values()}
         self.airgen.generate_ground_attack_strikegroup(*assigned_units_split(planes_flights),
-                                                       targets=[(mp, pos) for (n, mp, pos) in targets],
+                                                       targets=[(x.markpoint_name, x.position) for x in targets],
                                                        at=self.attackers_starting_position,
                                                        escort=len(self.sead) == 0)
 
         self.airgen.generate_sead_strikegroup(*assigned_units_split(self.sead),
-                                              targets=[(mp, pos) for (n, mp, pos) in sead_targets],
+                                              targets=[(x.markpoint_name, x.position) for x in sead_targets],
                                               at=self.attackers_starting_position,
                                               escort=len(self.sead) > 0)
 
@@ -82,7 +66,7 @@ class StrikeOperation(Operation):
             for farp, dict in zip(self.groundobjectgen.generate_farps(sum([x[0] for x in heli_flights.values()])),
                                   db.assignedunits_split_to_count(heli_flights, self.groundobjectgen.FARP_CAPACITY)):
                 self.airgen.generate_ground_attack_strikegroup(*assigned_units_split(dict),
-                                                               targets=[(mp, pos) for (n, mp, pos) in targets],
+                                                               targets=[(x.markpoint_name, x.position) for x in targets],
                                                                at=farp,
                                                                escort=len(planes_flights) == 0)
 
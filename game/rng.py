@@ -0,0 +1,59 @@
+import hashlib
+import random
+import typing
+
+STREAM_EVENTS = "events"
+STREAM_COMMISION = "commision"
+STREAM_PLACEMENT = "placement"
+STREAM_VISUAL = "visual"
+STREAM_WEATHER = "weather"
+
+SEED_BITS = 64
+
+
+def derive_seed(seed: int, *names: str) -> int:
+    digest = hashlib.sha256(str(seed).encode("utf-8"))
+    for name in names:
+        digest.update(b"\x00")
+        digest.update(str(name).encode("utf-8"))
+    return int.from_bytes(digest.digest()[:SEED_BITS // 8], "big")
+
+
+class RandomService:
+    """
+    Campaign-owned source of randomness. Every subsystem draws from its own named stream, so the
+    amount of numbers consumed by one of them (e.g. weather) won't shift the results of another (e.g. events).
+    Streams are seeded from the service seed and the stream name, which makes them independent of the order
+    they were first requested in. Use `fork` to hand a separate service to the parallel worker.
+    """
+
+    seed = 0  # type: int
+
+    def __init__(self, seed: int = None):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(SEED_BITS)
+
+        self.seed = seed
+        self._streams = {}  # type: typing.Dict[str, random.Random]
+
+    def __str__(self):
+        return "RandomService({})".format(self.seed)
+
+    def stream(self, name: str) -> random.Random:
+        stream = self._streams.get(name)
+        if stream is None:
+            stream = random.Random(derive_seed(self.seed, name))
+            self._streams[name] = stream
+
+        return stream
+
+    def fork(self, name: str) -> "RandomService":
+        return RandomService(derive_seed(self.seed, "fork", name))
+
+    def reseed(self, seed: int):
+        self.seed = seed
+        self._streams = {}
+
+    @property
+    def stream_names(self) -> typing.Collection[str]:
+        return list(self._streams.keys())
@@ -11,4 +11,7 @@ class Settings:
     multiplier = 1
     sams = True
     cold_start = False
+    save_compression = "zlib"
+    incremental_saves = False
+    save_history = False
     version = None
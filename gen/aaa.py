@@ -1,3 +1,5 @@
+import random
+
 from .conflictgen import *
 from .naming import *
 
@@ -10,9 +12,10 @@ EXTRA_AA_POSITION_FROM_CP = 550
 
 
 class AAConflictGenerator:
-    def __init__(self, mission: Mission, conflict: Conflict):
+    def __init__(self, mission: Mission, conflict: Conflict, rng: random.Random = random):
         self.m = mission
         self.conflict = conflict
+        self.rng = rng
 
     def generate_at_defenders_location(self, units: db.AirDefenseDict):
         for unit_type, count in units.items():
@@ -27,7 +30,7 @@ class AAConflictGenerator:
     def generate(self, units: db.AirDefenseDict):
         for type, count in units.items():
             for _, radial in zip(range(count), self.conflict.radials):
-                distance = randint(self.conflict.size * DISTANCE_FACTOR[0], self.conflict.size * DISTANCE_FACTOR[1])
+                distance = self.rng.randint(self.conflict.size * DISTANCE_FACTOR[0], self.conflict.size * DISTANCE_FACTOR[1])
                 p = self.conflict.position.point_from_heading(radial, distance)
 
                 self.m.vehicle_group(
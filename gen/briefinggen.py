@@ -32,6 +32,10 @@ class BriefingGenerator:
     def append_waypoint(self, description: str):
         self.waypoints.append(description)
 
+    def append_target_groups(self, groups: typing.Collection[StrikeTargetGroup]):
+        for group in groups:
+            self.append_waypoint("TARGET {} (TP {})".format(group.name, group.markpoint_name))
+
     def generate(self):
         self.waypoints.insert(0, "INITIAL")
         self.waypoints.append("RTB")
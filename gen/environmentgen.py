@@ -13,6 +13,7 @@ from dcs.action import *
 from dcs.weather import *
 
 from game import db
+from game.rng import STREAM_WEATHER
 from theater import *
 from gen import *
 
@@ -51,6 +52,10 @@ class EnviromentGenerator:
         self.conflict = conflict
         self.game = game
 
+    @property
+    def _rng(self) -> random.Random:
+        return self.game.rng.stream(STREAM_WEATHER)
+
     def _gen_random_time(self):
         start_time = datetime.strptime('May 25 2018 12:00AM', '%b %d %Y %I:%M%p')
 
@@ -59,11 +64,11 @@ class EnviromentGenerator:
             if self.game.settings.night_disabled and k == "night":
                 continue
 
-            if random.randint(0, 100) <= v:
+            if self._rng.randint(0, 100) <= v:
                 time_range = self.game.theater.daytime_map[k]
                 break
 
-        start_time += timedelta(hours=random.randint(*time_range))
+        start_time += timedelta(hours=self._rng.randint(*time_range))
         logging.info("time - {}, slot - {}, night skipped - {}".format(
             str(start_time),
             str(time_range),
@@ -74,7 +79,7 @@ class EnviromentGenerator:
     def _generate_wind(self, wind_speed, wind_direction=None):
         # wind
         if not wind_direction:
-            wind_direction = random.randint(0, 360)
+            wind_direction = self._rng.randint(0, 360)
 
         self.mission.weather.wind_at_ground = Wind(wind_direction, wind_speed)
         self.mission.weather.wind_at_2000 = Wind(wind_direction, wind_speed * 2)
@@ -82,22 +87,22 @@ class EnviromentGenerator:
 
     def _generate_base_weather(self):
         # clouds
-        self.mission.weather.clouds_base = random.randint(*WEATHER_CLOUD_BASE)
-        self.mission.weather.clouds_density = random.randint(*WEATHER_CLOUD_DENSITY)
-        self.mission.weather.clouds_thickness = random.randint(*WEATHER_CLOUD_THICKNESS)
+        self.mission.weather.clouds_base = self._rng.randint(*WEATHER_CLOUD_BASE)
+        self.mission.weather.clouds_density = self._rng.randint(*WEATHER_CLOUD_DENSITY)
+        self.mission.weather.clouds_thickness = self._rng.randint(*WEATHER_CLOUD_THICKNESS)
 
         # wind
-        self._generate_wind(random.randint(0, 4))
+        self._generate_wind(self._rng.randint(0, 4))
 
         # fog
-        if random.randint(0, 100) < WEATHER_FOG_CHANCE:
-            self.mission.weather.fog_visibility = random.randint(*WEATHER_FOG_VISIBILITY)
-            self.mission.weather.fog_thickness = random.randint(*WEATHER_FOG_THICKNESS)
+        if self._rng.randint(0, 100) < WEATHER_FOG_CHANCE:
+            self.mission.weather.fog_visibility = self._rng.randint(*WEATHER_FOG_VISIBILITY)
+            self.mission.weather.fog_thickness = self._rng.randint(*WEATHER_FOG_THICKNESS)
 
     def _gen_random_weather(self):
         weather_type = None
         for k, v in RANDOM_WEATHER.items():
-            if random.randint(0, 100) <= v:
+            if self._rng.randint(0, 100) <= v:
                 weather_type = k
                 break
 
@@ -105,17 +110,17 @@ class EnviromentGenerator:
         if weather_type == 1:
             # thunderstorm
             self._generate_base_weather()
-            self._generate_wind(random.randint(8, 12))
+            self._generate_wind(self._rng.randint(8, 12))
 
-            self.mission.weather.clouds_density = random.randint(9, 10)
+            self.mission.weather.clouds_density = self._rng.randint(9, 10)
             self.mission.weather.clouds_iprecptns = Weather.Preceptions.Thunderstorm
         elif weather_type == 2:
             # rain
             self._generate_base_weather()
-            self.mission.weather.clouds_density = random.randint(5, 8)
+            self.mission.weather.clouds_density = self._rng.randint(5, 8)
             self.mission.weather.clouds_iprecptns = Weather.Preceptions.Rain
 
-            self._generate_wind(random.randint(4, 8))
+            self._generate_wind(self._rng.randint(4, 8))
         elif weather_type == 3:
             # clouds
             self._generate_base_weather()
@@ -1,6 +1,7 @@
 import logging
 
 from game import db
+from game.rng import STREAM_PLACEMENT
 from .conflictgen import *
 from .naming import *
 
@@ -50,15 +51,15 @@ class GroundObjectsGenerator:
         else:
             cp = self.conflict.from_cp
 
+        # alive AA sites too close to the attackers' control point are left out of the mission
+        skipped_aa = self.game.theater.ground_object_store.within(self.conflict.from_cp.position, AA_CP_MIN_DISTANCE, category="aa", cp_id=cp.id)
+
         for ground_object in cp.ground_objects:
             if ground_object.dcs_identifier == "AA":
-                if ground_object.position.distance_to_point(self.conflict.from_cp.position) < AA_CP_MIN_DISTANCE:
-                    continue
-
-                if ground_object.is_dead:
+                if ground_object.is_dead or ground_object in skipped_aa:
                     continue
 
-                unit_type = random.choice(self.game.commision_unit_types(cp, AirDefence))
+                unit_type = self.game.rng.stream(STREAM_PLACEMENT).choice(self.game.commision_unit_types(cp, AirDefence))
                 assert unit_type is not None, "Cannot find unit type for GroundObject defense ({})!".format(cp)
 
                 group = self.m.vehicle_group(
@@ -10,6 +10,7 @@ from theater import *
 from .conflictgen import *
 #from game.game import Game
 from game import db
+from game.rng import STREAM_VISUAL
 
 
 class MarkerSmoke(unittype.StaticType):
@@ -113,7 +114,7 @@ class VisualGenerator:
                 position = plane_start.point_from_heading(turn_heading(heading, - 90), offset)
 
                 for k, v in FRONT_SMOKE_TYPE_CHANCES.items():
-                    if random.randint(0, 100) <= k:
+                    if self.game.rng.stream(STREAM_VISUAL).randint(0, 100) <= k:
                         pos = position.random_point_within(FRONT_SMOKE_RANDOM_SPREAD, FRONT_SMOKE_RANDOM_SPREAD)
                         if not self.game.theater.is_on_land(pos):
                             break
@@ -140,7 +141,7 @@ class VisualGenerator:
         spread = target.size * DESTINATION_SMOKE_DISTANCE_FACTOR
         for _ in range(0, int(target.size * DESTINATION_SMOKE_AMOUNT_FACTOR * (1.1 - target.base.strength))):
             for k, v in DESTINATION_SMOKE_TYPE_CHANCES.items():
-                if random.randint(0, 100) <= k:
+                if self.game.rng.stream(STREAM_VISUAL).randint(0, 100) <= k:
                     position = target.position.random_point_within(0, spread)
                     if not self.game.theater.is_on_land(position):
                         break
@@ -0,0 +1,225 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import typing
+
+from userdata import persistency, savefile
+
+PLAYER_COUNTRY = "USA"
+ENEMY_COUNTRY = "Russia"
+SEED = 1
+REPEATS = 3
+
+# allowed slowdown / growth against the baseline before a metric is reported as a regression
+REGRESSION_THRESHOLD = 0.1
+
+THEATERS = ["caucasus", "persiangulf", "nevada"]
+
+"""
+Synthetic campaign sizes: turns passed, initial units multiplier, ground object copies per control point.
+Share of enemy bases captured and ground objects destroyed grows with the turn count.
+"""
+SIZES = {
+    "small": (0, 1, 1),
+    "mid": (20, 2, 2),
+    "large": (60, 4, 4),
+}
+
+METRICS = ["save_ms", "load_ms", "bytes", "save_peak_kb", "load_peak_kb"]
+
+
+def new_theater(name: str):
+    from theater import caucasus, persiangulf, nevada
+
+    if name == "persiangulf":
+        return persiangulf.PersianGulfTheater()
+    elif name == "nevada":
+        return nevada.NevadaTheater()
+    else:
+        return caucasus.CaucasusTheater()
+
+
+def add_synthetic_ground_objects(theater, copies: int):
+    from dcs.mapping import Point
+    from theater.theatergroundobject import TheaterGroundObject
+
+    for cp in theater.controlpoints:
+        originals = list(cp.ground_objects)
+        if not originals:
+            continue
+
+        group_offset = max(x.group_id for x in originals)
+        for copy in range(1, copies):
+            for original in originals:
+                g = TheaterGroundObject()
+                g.cp_id = original.cp_id
+                g.group_id = original.group_id + group_offset * copy
+                g.object_id = original.object_id
+                g.dcs_identifier = original.dcs_identifier
+                g.heading = original.heading
+                g.position = Point(original.position.x + 1000 * copy, original.position.y)
+                theater.add_ground_object(cp, g)
+
+
+def build_campaign(theater_name: str, size: str):
+    from game.game import Game
+    from game.rng import RandomService, STREAM_PLACEMENT
+    from theater import start_generator
+
+    turns, multiplier, ground_object_copies = SIZES[size]
+
+    rng = RandomService(SEED)
+    theater = new_theater(theater_name)
+    start_generator.generate_inital_units(theater, ENEMY_COUNTRY, True, multiplier)
+    start_generator.generate_groundobjects(theater, rng.stream(STREAM_PLACEMENT))
+    add_synthetic_ground_objects(theater, ground_object_copies)
+
+    game = Game(PLAYER_COUNTRY, ENEMY_COUNTRY, theater, rng)
+    game.settings.version = "benchmark"
+    game.pass_turn(no_action=True)
+
+    progress = turns / max(x[0] for x in SIZES.values())
+    controlpoints = [cp for cp in theater.controlpoints if not cp.is_global]
+    for cp in controlpoints[:int(len(controlpoints) * progress * 0.8)]:
+        cp.captured = True
+
+    ground_objects = [x for cp in theater.controlpoints for x in cp.ground_objects]
+    for ground_object in ground_objects[:int(len(ground_objects) * progress * 0.7)]:
+        theater.kill_ground_object(ground_object)
+
+    while game.turn < turns:
+        game.pass_turn()
+
+    return game
+
+
+def timed(action: typing.Callable) -> typing.Tuple[float, typing.Any]:
+    started = time.perf_counter()
+    result = action()
+    return (time.perf_counter() - started) * 1000, result
+
+
+def peak_memory(action: typing.Callable) -> typing.Tuple[float, typing.Any]:
+    # traced separately from the timing, since tracemalloc slows allocations down considerably
+    tracemalloc.start()
+    result = action()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024, result
+
+
+def save_and_flush(game):
+    persistency.save_game(game)
+    persistency.flush_saves()
+
+
+def run_case(theater_name: str, size: str) -> typing.List[typing.Dict[str, typing.Any]]:
+    game = build_campaign(theater_name, size)
+
+    results = []
+    with tempfile.TemporaryDirectory() as user_folder:
+        os.makedirs(os.path.join(user_folder, "DCS"))
+        persistency.setup(user_folder)
+
+        for codec in savefile.CODECS.keys():
+            game.settings.save_compression = codec
+            save_times, load_times = [], []
+            for _ in range(REPEATS):
+                save_ms, _ = timed(lambda: save_and_flush(game))
+                # continue with the loaded game, so every round trip saves the state restored by the previous one
+                load_ms, game = timed(persistency.restore_game)
+                save_times.append(save_ms)
+                load_times.append(load_ms)
+
+            save_peak_kb, _ = peak_memory(lambda: save_and_flush(game))
+            load_peak_kb, game = peak_memory(persistency.restore_game)
+
+            results.append({
+                "case": "{}/{}".format(theater_name, size),
+                "codec": codec,
+                "save_ms": min(save_times),
+                "load_ms": min(load_times),
+                "bytes": os.path.getsize(os.path.join(persistency.base_path(), "liberation_save")),
+                "save_peak_kb": save_peak_kb,
+                "load_peak_kb": load_peak_kb,
+            })
+
+    return results
+
+
+def run_all(theaters: typing.Collection[str], sizes: typing.Collection[str]) -> typing.List[typing.Dict[str, typing.Any]]:
+    # control points are class level theater data, so every campaign is built in a separate process
+    results = []
+    for theater_name in theaters:
+        for size in sizes:
+            output = subprocess.check_output([sys.executable, __file__, "--case", theater_name, size])
+            results += json.loads(output.decode("utf-8").splitlines()[-1])
+
+    return results
+
+
+def print_results(results: typing.List[typing.Dict[str, typing.Any]]):
+    print("{:<20}{:<8}".format("case", "codec") + "".join("{:>14}".format(x) for x in METRICS))
+    for result in results:
+        print("{:<20}{:<8}".format(result["case"], result["codec"]) + "".join("{:>14.1f}".format(result[x]) for x in METRICS))
+
+
+def compare(results: typing.List[typing.Dict[str, typing.Any]], baseline: typing.List[typing.Dict[str, typing.Any]], threshold: float) -> bool:
+    baseline_by_key = {(x["case"], x["codec"]): x for x in baseline}
+
+    regressions = 0
+    print("{:<20}{:<8}".format("case", "codec") + "".join("{:>14}".format(x) for x in METRICS))
+    for result in results:
+        reference = baseline_by_key.get((result["case"], result["codec"]))
+        if not reference:
+            continue
+
+        columns = []
+        for metric in METRICS:
+            change = result[metric] / reference[metric] - 1 if reference[metric] else 0
+            if change > threshold:
+                regressions += 1
+            columns.append("{:>+13.0%}{}".format(change, "!" if change > threshold else " "))
+
+        print("{:<20}{:<8}".format(result["case"], result["codec"]) + "".join(columns))
+
+    print("{} regressions over {:.0%}".format(regressions, threshold))
+    return regressions == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Save/load benchmark on synthetic campaigns")
+    parser.add_argument("--theater", action="append", choices=THEATERS, help="theaters to run, all by default")
+    parser.add_argument("--size", action="append", choices=list(SIZES.keys()), help="campaign sizes to run, all by default")
+    parser.add_argument("--output", help="write results as json")
+    parser.add_argument("--baseline", help="compare results with a json written by --output")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument("--case", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(*args.case)))
+        return
+
+    results = run_all(args.theater or THEATERS, args.size or list(SIZES.keys()))
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"results": results}, f, indent=1)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)["results"]
+
+        if not compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import datetime
+import sys
+
+from userdata import persistency
+
+"""
+Lists turns kept in the save history of the current campaign, or restores one of them as the current save:
+
+    save_history.py <user folder>
+    save_history.py <user folder> <turn>
+"""
+
+persistency.setup(sys.argv[1])
+header = persistency.restore_header()
+assert header and header.campaign_id, "No campaign save to list the history of"
+history = persistency.save_history(header.campaign_id)
+
+if len(sys.argv) < 3:
+    for entry in history.entries():
+        timestamp = datetime.datetime.fromtimestamp(entry.header.timestamp)
+        print("{:>5} {:<20} {:<20} budget {:<8} {}".format(entry.turn, entry.header.theater, entry.header.game_version, entry.header.budget, timestamp))
+
+    print("history disk usage: {:.1f} kb".format(history.disk_usage() / 1024))
+else:
+    game = history.restore(int(sys.argv[2]))
+    persistency.save_game(game)
+    persistency.flush_saves()
@@ -1,10 +1,20 @@
-from tests.integration import baseattack, convoystrike, frontlineattack, insurgentattack, intercept, navalintercept, strike
+from tests.integration import baseattack, convoystrike, frontlineattack, infantrytransport, insurgentattack, intercept, navalintercept, strike, restore, directorywatcher, debriefinglog, unitdict, savefile, rng, inventory, commision, groundobjects
 
 if __name__ == "__main__":
     baseattack.execute_all()
     convoystrike.execute_all()
     frontlineattack.execute_all()
+    infantrytransport.execute_all()
     insurgentattack.execute_all()
     intercept.execute_all()
     navalintercept.execute_all()
     strike.execute_all()
+    restore.execute_all()
+    directorywatcher.execute_all()
+    debriefinglog.execute_all()
+    unitdict.execute_all()
+    savefile.execute_all()
+    rng.execute_all()
+    inventory.execute_all()
+    commision.execute_all()
+    groundobjects.execute_all()
@@ -0,0 +1,51 @@
+from theater.caucasus import CaucasusTheater
+
+from game.commision import *
+
+from tests.integration.util import *
+
+PLAYER_COUNTRY = "USA"
+ENEMY_COUNTRY = "Russia"
+
+
+def base_state(cps: typing.Collection[ControlPoint]):
+    return [(cp.base.inventory_array(), dict(cp.base.commision_points)) for cp in cps]
+
+
+def execute_all():
+    game, theater = init(PLAYER_COUNTRY, ENEMY_COUNTRY, CaucasusTheater)
+    cps = theater.enemy_points()
+    for cp in cps:
+        # empty bases, so every control point has a deficit in every task
+        cp.base.commit_losses(dict(cp.base.all_units))
+
+    planner = CommisionPlanner(game)
+    full_amounts = {(order.cp, order.task): order.awarded_points for order in planner.plan(cps, budget=float("inf"))}
+    assert len(full_amounts) == len(cps) * len(COMMISION_TASKS)
+
+    # insufficient budget goes to the largest deficits first and is never exceeded
+    budget = sum(full_amounts.values()) / 3
+    state = base_state(cps)
+    batch = planner.plan(cps, budget)
+    assert base_state(cps) == state, "planning changed the bases"
+
+    assert abs(sum(order.awarded_points for order in batch) - budget) < 1e-6
+    assert [order.priority for order in batch] == sorted([order.priority for order in batch], reverse=True)
+    funded = [order.awarded_points == full_amounts[order.cp, order.task] for order in batch]
+    assert funded[0] and not funded[-1] and funded == sorted(funded, reverse=True), funded
+    assert all(order.awarded_points == 0 for order in batch[funded.index(False) + 1:])
+
+    # default turn budget is limited too
+    assert sum(order.awarded_points for order in planner.plan(cps)) <= planner.budget(cps) + 1e-6
+
+    planner.commit(batch)
+    assert sum(count for cp in cps for _, count in cp.base.all_units) == sum(order.points for order in batch)
+    for order in batch:
+        if order.points:
+            assert order.unit_type and order.cp.base.total_units_of_type(order.unit_type) >= order.points
+
+    print("commision: ok")
+
+
+if __name__ == "__main__":
+    execute_all()
@@ -0,0 +1,170 @@
+import io
+import os
+import re
+import random
+import tempfile
+
+from dcs.lua import parse
+
+from userdata.debriefing import *
+from userdata import luastream
+
+EVENT_COUNT = 3000
+EVENT_TYPES = ["crash", "dead", "hit", "shot", "takeoff", "land"]
+
+
+def generate_debriefing_log(rng: random.Random, event_count: int) -> str:
+    lines = ['mission_time\t=\t"3600.5"', "debriefing = ", "{"]
+    lines += ['\t["triggers_state"] = ', "\t{"]
+    for i in range(rng.randint(0, 3)):
+        lines += ['\t\t[{}] = {{ ["flag"] = {}, ["state"] = true, }}, -- end of [{}]'.format(i + 1, i + 10, i + 1)]
+    lines += ['\t}, -- end of ["triggers_state"]']
+
+    lines += ['\t["events"] = ', "\t{"]
+    for i in range(event_count):
+        lines += ["\t\t[{}] = ".format(i + 1), "\t\t{"]
+        lines += ['\t\t\t["type"] = "{}",'.format(rng.choice(EVENT_TYPES))]
+        lines += ['\t\t\t["initiator"] = "Unit \\"{}\\"",'.format(i)]
+        lines += ['\t\t\t["initiatorMissionID"] = "{}",'.format(i + 1)]
+        lines += ['\t\t\t["t"] = {},'.format(rng.uniform(-10, 5000))]
+        lines += ['\t\t\t["weapon"] = {{ ["name"] = "AIM-120C", ["count"] = {}, ["flags"] = {{ 1, 2, false, }}, }},'.format(i)]
+        lines += ["\t\t}}, -- end of [{}]".format(i + 1)]
+    lines += ['\t}, -- end of ["events"]']
+
+    lines += ['\t["result"] = { ["score"] = -1500.5, ["name"] = "result", },', "} -- end of debriefing"]
+    return "\n".join(lines) + "\n"
+
+
+def reference_parse_mutliplayer_debriefing(contents: str):
+    result = {}
+    element = None
+
+    in_events = False
+
+    for line in [x.strip() for x in contents.splitlines()]:
+        if line.startswith("events ="):
+            in_events = True
+        elif line.startswith("} -- end of events"):
+            in_events = False
+
+        if not in_events:
+            continue
+
+        key = None
+        if line.startswith("initiator\t"):
+            key = "initiator"
+            if element is None:
+                element = {}
+        elif line.startswith("initiatorMissionID\t"):
+            key = "initiatorMissionID"
+            if element is None:
+                element = {}
+        elif line.startswith("type\t"):
+            key = "type"
+            if element is None:
+                element = {}
+        elif line.startswith("}, -- end of ["):
+            result[len(result)] = element
+            element = None
+            continue
+        else:
+            continue
+
+        value = re.findall(r"=\s*\"(.*?)\",", line)[0]
+        element[key] = value
+
+    return {"debriefing": {"events": result}}
+
+
+def generate_multiplayer_debriefing_log(rng: random.Random, event_count: int) -> str:
+    lines = ["mission_time\t=\t3600.5,", 'initiator\t=\t"outside of events",', "events = ", "{"]
+    for i in range(event_count):
+        lines += ["\t[{}] = ".format(i + 1), "\t{"]
+        lines += ['\t\ttype\t=\t"{}",'.format(rng.choice(EVENT_TYPES))]
+        lines += ['\t\tinitiator\t=\t"Unit = \\"{}\\"",'.format(i)]
+        lines += ["\t\tt\t=\t{},".format(rng.uniform(0, 5000))]
+        lines += ['\t\tinitiatorMissionID\t=\t"{}",'.format(i + 1)]
+        lines += ["\t}}, -- end of [{}]".format(i + 1)]
+    lines += ["} -- end of events", 'type\t=\t"outside of events",', "stats = -nan(ind)"]
+    return "\r\n".join(lines) + "\r\n"
+
+
+def check_malformed_log():
+    # garbage is reported once a chunk past it is buffered, not after the whole file was read into memory
+    f = io.BytesIO(b"debriefing = {\n\x01" + b"a" * luastream.CHUNK_SIZE * 8)
+    try:
+        list(luastream.tokenize(f))
+        assert False, "malformed log was accepted"
+    except ValueError:
+        pass
+
+    assert f.tell() <= luastream.CHUNK_SIZE * 2, f.tell()
+
+
+def check_oversized_token(path: str):
+    # strings longer than a chunk are read in full, instead of failing the log over to the multiplayer parser
+    contents = generate_debriefing_log(random.Random(1), 10)
+    long_string = "x" * luastream.CHUNK_SIZE * 3
+    contents = contents.replace('"AIM-120C"', '"{}"'.format(long_string), 1)
+    with open(path, "w") as f:
+        f.write(contents)
+
+    events = [value for kind, value in read_debriefing_log(path) if kind == DEBRIEFING_EVENT]
+    expected_events = [{k: v for k, v in event.items() if k in DEBRIEFING_EVENT_FIELDS} for event in parse.loads(contents)["debriefing"]["events"].values()]
+    assert events == expected_events
+
+    expected_dead = {int(event["initiatorMissionID"]) for event in expected_events if event["type"] in ["crash", "dead"]}
+    assert expected_dead and Debriefing.parse(path)._dead_units == expected_dead
+
+    tokens = list(luastream.tokenize(io.BytesIO('["comment"] = 1 -- {}\n["string"] = "{}"'.format(long_string, long_string).encode())))
+    assert tokens[-1] == (luastream.TOKEN_STRING, '"{}"'.format(long_string).encode())
+
+
+def execute_all(seed=0):
+    rng = random.Random(seed)
+    contents = generate_debriefing_log(rng, EVENT_COUNT)
+
+    fd, path = tempfile.mkstemp(suffix="." + DEBRIEFING_LOG_EXTENSION)
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(contents)
+
+        table = parse.loads(contents)["debriefing"]
+        expected_events = [{k: v for k, v in event.items() if k in DEBRIEFING_EVENT_FIELDS} for event in table["events"].values()]
+
+        events = []
+        trigger_state = None
+        for kind, value in read_debriefing_log(path):
+            if kind == DEBRIEFING_EVENT:
+                events.append(value)
+            else:
+                trigger_state = value
+
+        assert events == expected_events
+        assert trigger_state == table["triggers_state"], (trigger_state, table["triggers_state"])
+
+        expected_dead = [int(event["initiatorMissionID"]) for event in expected_events if event["type"] in ["crash", "dead"]]
+
+        debriefing = Debriefing.parse(path)
+        assert debriefing._dead_units == set(expected_dead)
+
+        contents = generate_multiplayer_debriefing_log(rng, EVENT_COUNT)
+        with open(path, "w", newline="") as f:
+            f.write(contents)
+
+        table = parse_mutliplayer_debriefing(path)
+        assert table == reference_parse_mutliplayer_debriefing(contents)
+
+        debriefing = Debriefing.parse(path)
+        assert debriefing._dead_units == {int(event["initiatorMissionID"]) for event in table["debriefing"]["events"].values() if event["type"] in ["crash", "dead"]}
+
+        check_oversized_token(path)
+    finally:
+        os.remove(path)
+
+    check_malformed_log()
+    print("debriefinglog: {} events ok".format(EVENT_COUNT))
+
+
+if __name__ == "__main__":
+    execute_all()
@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from userdata import directorywatcher
+from userdata.directorywatcher import DirectoryWatcher
+
+SETTLE_TIME = 0.5
+WRITE_COUNT = 4
+JOIN_TIMEOUT = 10
+
+
+def fd_is_open(fd: int) -> bool:
+    try:
+        os.fstat(fd)
+        return True
+    except OSError:
+        return False
+
+
+def start_wait(watcher: DirectoryWatcher):
+    result = {}
+
+    def wait():
+        result["path"] = watcher.wait_for_file()
+        result["at"] = time.monotonic()
+
+    thread = threading.Thread(target=wait, daemon=True)
+    thread.start()
+    return thread, result
+
+
+def check_debounce(directory: str, watcher: DirectoryWatcher):
+    thread, result = start_wait(watcher)
+
+    path = os.path.join(directory, "debriefing.log")
+    with open(path, "w") as f:
+        for i in range(WRITE_COUNT):
+            f.write("line {}\n".format(i))
+            f.flush()
+            time.sleep(SETTLE_TIME / 2)
+            assert "path" not in result, "file reported while it was still written"
+    written_at = time.monotonic()
+
+    thread.join(JOIN_TIMEOUT)
+    assert result.get("path") == path, result
+    assert result["at"] - written_at >= SETTLE_TIME - 0.1, "file reported before it settled"
+
+    # backend has to be released once a file was returned and the watcher closed
+    fd = getattr(watcher.backend, "fd", None)
+    assert fd is None or fd_is_open(fd)
+    watcher.close()
+    assert fd is None or not fd_is_open(fd), "watcher leaked the inotify fd"
+    assert watcher.wait_for_file() is None
+
+
+def check_cancel(directory: str, watcher: DirectoryWatcher):
+    thread, result = start_wait(watcher)
+    time.sleep(SETTLE_TIME)
+
+    fd = getattr(watcher.backend, "fd", None)
+    watcher.close()
+    thread.join(JOIN_TIMEOUT)
+    assert not thread.is_alive(), "cancelled wait didn't return"
+    assert result["path"] is None
+    assert fd is None or not fd_is_open(fd), "watcher leaked the inotify fd"
+
+
+def execute_mode(name: str, polling: bool):
+    directory = tempfile.mkdtemp()
+    try:
+        watcher = DirectoryWatcher(directory, SETTLE_TIME)
+        if polling:
+            assert watcher.is_polling
+        check_debounce(directory, watcher)
+        check_cancel(directory, DirectoryWatcher(directory, SETTLE_TIME))
+    finally:
+        shutil.rmtree(directory)
+
+    print("directorywatcher: {} ok".format(name))
+
+
+def execute_all():
+    execute_mode("native", polling=False)
+
+    load_libc_inotify = directorywatcher._load_libc_inotify
+    directorywatcher._load_libc_inotify = lambda: None
+    try:
+        execute_mode("polling", polling=True)
+    finally:
+        directorywatcher._load_libc_inotify = load_libc_inotify
+
+
+if __name__ == "__main__":
+    execute_all()
@@ -0,0 +1,102 @@
+import pickle
+
+from theater.caucasus import CaucasusTheater
+from theater.theatergroundobject import CATEGORY_BY_IDENTIFIER
+
+from tests.integration.util import *
+
+PLAYER_COUNTRY = "USA"
+ENEMY_COUNTRY = "Russia"
+
+
+def copy_ground_object(ground_object: TheaterGroundObject) -> TheaterGroundObject:
+    result = TheaterGroundObject()
+    result.cp_id = ground_object.cp_id
+    result.group_id = ground_object.group_id
+    result.object_id = ground_object.object_id
+    result.dcs_identifier = ground_object.dcs_identifier
+    result.heading = ground_object.heading
+    result.position = ground_object.position
+    return result
+
+
+def check_shared_identifier_kill(game: Game, theater: ConflictTheater):
+    cp = next(cp for cp in theater.enemy_points() if cp.ground_objects)
+    ground_object = next(x for x in cp.ground_objects if not x.is_dead)
+    string_identifier = ground_object.string_identifier
+
+    # units of a multi-unit group can share the string identifier, all of them are killed
+    theater.add_ground_object(cp, copy_ground_object(ground_object))
+    shared = theater.find_ground_objects(string_identifier)
+    assert len(shared) >= 2 and all(x.string_identifier == string_identifier for x in shared)
+
+    debriefing = Debriefing([], [])
+    debriefing.destroyed_objects = [string_identifier]
+    StrikeEvent(game, theater.player_points()[0], cp, cp.position, PLAYER_COUNTRY, ENEMY_COUNTRY).commit(debriefing)
+
+    assert all(x.is_dead for x in shared)
+    assert not theater.find_ground_objects(string_identifier)
+    assert all(x.is_dead for x in cp.ground_objects if x.string_identifier == string_identifier)
+
+
+def check_store_queries(theater: ConflictTheater):
+    store = theater.ground_object_store
+    ground_objects = [x for cp in theater.controlpoints for x in cp.ground_objects]
+    assert len(store) == len(ground_objects)
+    theater.kill_ground_object(ground_objects[0])
+
+    for alive in [True, False]:
+        candidates = [x for x in ground_objects if not alive or not x.is_dead]
+        assert set(store.find(alive=alive)) == set(candidates)
+
+        for cp in theater.controlpoints:
+            expected = [x for x in candidates if x.cp_id == cp.id and x.dcs_identifier == "AA"]
+            assert store.find("aa", cp.id, alive) == expected
+
+            # alive AA within range of a control point
+            in_range = [x for x in expected if x.position.distance_to_point(cp.position) <= 80000]
+            assert store.within(cp.position, 80000, "aa", cp.id, alive) == in_range
+
+        # objects per category per control point
+        counts = {}
+        for ground_object in candidates:
+            key = ground_object.cp_id, CATEGORY_BY_IDENTIFIER.get(ground_object.dcs_identifier)
+            counts[key] = counts.get(key, 0) + 1
+
+        assert store.count_by_category(alive) == counts
+
+
+def check_identifiers_from_columns(theater: ConflictTheater):
+    ground_objects = [x for cp in theater.controlpoints for x in cp.ground_objects]
+    alive = {}
+    for ground_object in ground_objects:
+        if not ground_object.is_dead:
+            alive[ground_object.string_identifier] = alive.get(ground_object.string_identifier, 0) + 1
+    dead = frozenset(x.string_identifier for x in ground_objects if x.is_dead)
+    assert dead, "no dead ground objects to check"
+
+    # index and dead objects of a loaded theater come from the store columns, objects are not materialized
+    restored = pickle.loads(pickle.dumps(theater))
+    assert {k: len(v) for k, v in restored.ground_object_index.items()} == alive
+    assert frozenset(x for _, x in restored.ground_object_identifiers(alive=False)) == dead
+    assert not list(restored.ground_object_store.materialized_objects())
+
+    string_identifier = next(iter(alive))
+    found = restored.find_ground_objects(string_identifier)
+    assert len(found) == alive[string_identifier] and all(x.string_identifier == string_identifier and not x.is_dead for x in found)
+
+    restored.kill_ground_object(found[0])
+    assert len(restored.find_ground_objects(string_identifier)) == alive[string_identifier] - 1
+
+
+def execute_all():
+    game, theater = init(PLAYER_COUNTRY, ENEMY_COUNTRY, CaucasusTheater)
+    check_store_queries(theater)
+    check_shared_identifier_kill(game, theater)
+    check_identifiers_from_columns(theater)
+
+    print("groundobjects: ok")
+
+
+if __name__ == "__main__":
+    execute_all()
@@ -0,0 +1,57 @@
+from theater.caucasus import CaucasusTheater
+from theater.nevada import NevadaTheater
+
+from game.event.infantrytransport import InfantryTransportEvent
+from gen.conflictgen import Conflict
+
+from tests.integration.util import *
+
+PLAYER_COUNTRY = "USA"
+ENEMY_COUNTRY = "Russia"
+
+
+def execute(game, player_cp, enemy_cp, departure_cp = None):
+    e = InfantryTransportEvent(game, player_cp, enemy_cp, enemy_cp.position, PLAYER_COUNTRY, ENEMY_COUNTRY)
+
+    departures = [departure_cp] if departure_cp else game.theater.player_points()
+    for departure_cp in departures:
+        if e.is_departure_available_from(departure_cp):
+            print("{} for {} ({}) - {} ({})".format(e, player_cp, departure_cp, enemy_cp, enemy_cp.base.strength))
+            e.departure_cp = departure_cp
+            e.player_attacking(autoflights_for(e, PLAYER_COUNTRY))
+
+            e.generate()
+            execute_autocommit(e)
+            regular_manifest = e.operation.regular_manifest
+
+            # operation toggles is_quick while generating, quick mission should still get its own manifest
+            e.generate_quick()
+            assert e.operation.quick_manifest is not None
+            assert e.operation.regular_manifest is regular_manifest
+
+            # empty trigger state of the quick mission selects the quick manifest
+            debriefing = autodebrief_for(e, AutodebriefType.EVERYONE_DEAD)
+            debriefing.calculate_units(regular_manifest=e.operation.regular_manifest,
+                                       quick_manifest=e.operation.quick_manifest,
+                                       player_name=PLAYER_COUNTRY,
+                                       enemy_name=ENEMY_COUNTRY)
+            assert debriefing.destroyed_units[PLAYER_COUNTRY], "quick mission units were not resolved"
+            execute_autocommit(e)
+
+
+def execute_theater(theater_klass):
+    print("Theater: {}".format(theater_klass))
+    game, theater = init(PLAYER_COUNTRY, ENEMY_COUNTRY, theater_klass)
+
+    for player_cp, enemy_cp in theater.conflicts():
+        if Conflict.has_frontline_between(player_cp, enemy_cp):
+            execute(game, player_cp, enemy_cp)
+
+
+def execute_all():
+    for theater_klass in [CaucasusTheater, PersianGulfTheater, NevadaTheater]:
+        execute_theater(theater_klass)
+
+
+if __name__ == "__main__":
+    execute_all()
@@ -0,0 +1,56 @@
+from theater.caucasus import CaucasusTheater
+from theater.inventory import InventoryMatrix
+
+from tests.integration.util import *
+
+PLAYER_COUNTRY = "USA"
+ENEMY_COUNTRY = "Russia"
+TASKS = [CAP, CAS, PinpointStrike, AirDefence]
+
+
+def side_points(theater: ConflictTheater, captured: bool = None) -> typing.List[ControlPoint]:
+    return [cp for cp in theater.controlpoints if captured is None or cp.captured == captured]
+
+
+def execute_all():
+    game, theater = init(PLAYER_COUNTRY, ENEMY_COUNTRY, CaucasusTheater)
+    for cp in theater.controlpoints[::2]:
+        cp.captured = True
+
+    matrix = theater.inventory_matrix()
+    for captured in [None, True, False]:
+        cps = side_points(theater, captured)
+
+        totals = matrix.column_totals(captured)
+        for unit_id, unit_type in enumerate(db.UNIT_CATALOG):
+            assert totals[unit_id] == sum(cp.base.total_units_of_type(unit_type) for cp in cps), unit_type
+
+        for task in TASKS:
+            assert matrix.total_units(task, captured) == sum(cp.base.total_units(task) for cp in cps), task
+            assert matrix.total_units_per_cp(task, captured) == {cp: cp.base.total_units(task) for cp in cps}, task
+
+            available = [(unit_type, cp) for cp in cps for unit_type, count in cp.base.all_units if count and db.TASK_BY_UNIT.get(unit_type) == task]
+            cheapest = matrix.cheapest_available(task, captured)
+            if not available:
+                assert cheapest is None
+            else:
+                unit_type, cp = cheapest
+                assert cp in cps and cp.base.total_units_of_type(unit_type) > 0
+                assert db.PRICES[unit_type] == min(db.PRICES[x] for x, _ in available)
+
+    # restoring the snapshot brings back the inventories as they were
+    snapshot = matrix.snapshot()
+    expected = [cp.base.inventory_array() for cp in theater.controlpoints]
+    for cp in theater.enemy_points():
+        cp.base.commit_losses(dict(cp.base.all_units))
+        assert not any(cp.base.inventory_array())
+
+    matrix.restore(snapshot)
+    assert [cp.base.inventory_array() for cp in theater.controlpoints] == expected
+    assert InventoryMatrix.from_theater(theater).rows == expected
+
+    print("inventory: ok")
+
+
+if __name__ == "__main__":
+    execute_all()
@@ -0,0 +1,89 @@
+import array
+import io
+import pickle
+import zlib
+
+from theater.caucasus import CaucasusTheater
+
+from userdata import savefile, savejournal
+
+from tests.integration.util import *
+
+PLAYER_COUNTRY = "USA"
+ENEMY_COUNTRY = "Russia"
+
+
+def cp_state(game) -> typing.List[typing.Tuple[str, bool, float]]:
+    return [(cp.name, cp.captured, cp.base.strength) for cp in game.theater.controlpoints]
+
+
+def check_carrier_connections():
+    # every carrier has id 0, connections to them have to be restored to the right one
+    game, theater = init(PLAYER_COUNTRY, ENEMY_COUNTRY, PersianGulfTheater)
+    cp = theater.controlpoints[0]
+    cp.connect(to=theater.east_carrier)
+    try:
+        restored = savefile.read(io.BytesIO(savefile.dumps(game)))
+    finally:
+        cp.connected_points.remove(theater.east_carrier)
+
+    assert restored.theater.controlpoints[0].connected_points[-1] is restored.theater.east_carrier
+    assert restored.theater.east_carrier.name == theater.east_carrier.name
+
+
+def check_journal_catalog():
+    # journal replayed after the unit catalog changed still restores the units that were recorded
+    game, theater = init(PLAYER_COUNTRY, ENEMY_COUNTRY, CaucasusTheater)
+    snapshot = savefile.dumps(game)
+    journal = savejournal.SaveJournal()
+    journal.resume(game, 0, 0, 0)
+
+    index, cp = next((i, x) for i, x in enumerate(theater.controlpoints) if not x.captured)
+    cp.base.commision_units({db.PRICE_RANKING_OF_TASK[PinpointStrike][0]: 3, db.PRICE_RANKING_OF_TASK[CAP][-1]: 2})
+    expected = cp.base.inventory_array()
+
+    record = journal.record(game)
+    delta = pickle.loads(zlib.decompress(record[savejournal.RECORD_LENGTH.size:]))
+    assert delta[savejournal.SECTION_CATALOG][index] == db.UNIT_CATALOG_NAMES
+
+    # as if written by a version with the catalog in reverse order
+    captured, strength, inventory, commision_points = delta[savejournal.SECTION_CONTROLPOINTS][index]
+    inventory = array.array(INVENTORY_TYPECODE, inventory)[::-1].tobytes()
+    delta[savejournal.SECTION_CONTROLPOINTS][index] = captured, strength, inventory, commision_points
+    delta[savejournal.SECTION_CATALOG][index] = tuple(reversed(db.UNIT_CATALOG_NAMES))
+
+    restored = savefile.read(io.BytesIO(snapshot))
+    savejournal.apply_delta(restored, savejournal.merge_deltas([delta]))
+    assert restored.theater.controlpoints[index].base.inventory_array() == expected
+
+
+def execute_all():
+    game, theater = init(PLAYER_COUNTRY, ENEMY_COUNTRY, CaucasusTheater)
+    theater.controlpoints[0].captured = True
+
+    first = savefile.read(io.BytesIO(savefile.dumps(game)))
+    first_state = cp_state(first)
+    assert first_state == cp_state(game)
+
+    # restored control points are copies and connect to each other, not to the class level ones
+    for cp, original in zip(first.theater.controlpoints, theater.controlpoints):
+        assert cp is not original and cp.base is not original.base
+        assert all(x in first.theater.controlpoints for x in cp.connected_points)
+        assert [first.theater.controlpoints.index(x) for x in cp.connected_points] == [theater.controlpoints.index(x) for x in original.connected_points]
+
+    for cp in theater.controlpoints:
+        cp.captured = not cp.captured
+        cp.base.strength = 0.5
+
+    second = savefile.read(io.BytesIO(savefile.dumps(game)))
+    assert cp_state(second) == cp_state(game)
+    assert cp_state(first) == first_state, "loading a game changed the previously loaded one"
+    assert all(x is not y for x, y in zip(first.theater.controlpoints, second.theater.controlpoints))
+
+    check_carrier_connections()
+    check_journal_catalog()
+    print("restore: ok")
+
+
+if __name__ == "__main__":
+    execute_all()
@@ -0,0 +1,57 @@
+import pickle
+
+from game.rng import *
+
+SEED = 1234
+DRAWS = 50
+
+
+def draw(stream: random.Random) -> typing.List[float]:
+    return [stream.random() for _ in range(DRAWS)]
+
+
+def execute_all():
+    # same seed gives the same numbers, regardless of the order streams were requested in
+    first, second = RandomService(SEED), RandomService(SEED)
+    first_events = draw(first.stream(STREAM_EVENTS))
+    first_weather = draw(first.stream(STREAM_WEATHER))
+    second_weather = draw(second.stream(STREAM_WEATHER))
+    second_events = draw(second.stream(STREAM_EVENTS))
+    assert first_events == second_events and first_weather == second_weather
+    assert first_events != draw(RandomService(SEED + 1).stream(STREAM_EVENTS))
+
+    # streams are independent: draining one doesn't shift another
+    service = RandomService(SEED)
+    draw(service.stream(STREAM_VISUAL))
+    draw(service.stream(STREAM_VISUAL))
+    assert draw(service.stream(STREAM_EVENTS)) == first_events
+    assert first_events != first_weather
+    assert service.stream(STREAM_EVENTS) is service.stream(STREAM_EVENTS)
+    assert sorted(service.stream_names) == sorted([STREAM_VISUAL, STREAM_EVENTS])
+
+    # forks are deterministic, independent of the parent and of each other, and don't consume parent streams
+    service = RandomService(SEED)
+    fork = service.fork("worker")
+    assert fork.seed == RandomService(SEED).fork("worker").seed
+    assert fork.seed != service.fork("other").seed
+    assert draw(fork.stream(STREAM_EVENTS)) != first_events
+    assert draw(service.stream(STREAM_EVENTS)) == first_events
+
+    # reseeding drops the existing streams and restarts them from the new seed
+    service.reseed(SEED + 1)
+    assert service.seed == SEED + 1 and not service.stream_names
+    assert draw(service.stream(STREAM_EVENTS)) == draw(RandomService(SEED + 1).stream(STREAM_EVENTS))
+    service.reseed(SEED)
+    assert draw(service.stream(STREAM_EVENTS)) == first_events
+
+    # saved service carries on where it left off
+    service = RandomService(SEED)
+    draw(service.stream(STREAM_EVENTS))
+    restored = pickle.loads(pickle.dumps(service))
+    assert draw(restored.stream(STREAM_EVENTS)) == draw(service.stream(STREAM_EVENTS))
+
+    print("rng: ok")
+
+
+if __name__ == "__main__":
+    execute_all()
@@ -0,0 +1,173 @@
+import io
+import os
+import pickle
+import tempfile
+import threading
+
+from userdata import persistency, savefile, savehistory, savejournal, savewriter
+from userdata.savewriter import SaveWriter
+
+
+class Settings:
+    version = "1.5"
+    save_history = True
+
+
+class SaveableTheater:
+    pass
+
+
+class SaveableGame:
+    def __init__(self):
+        self.settings = Settings()
+        self.theater = SaveableTheater()
+        self.turn = 3
+        self.budget = 420
+        self.campaign_id = "campaign"
+
+
+def check_history_per_campaign(directory: str):
+    persistency.setup(directory)
+    os.makedirs(persistency.base_path(), exist_ok=True)
+    recorded = []
+
+    def record(history, game):
+        if game.budget < 0:
+            raise ValueError("history failed")
+        recorded.append((os.path.relpath(history.directory, persistency.history_directory()), game.turn))
+
+    savehistory_record = savehistory.SaveHistory.record
+    savehistory.SaveHistory.record = record
+    try:
+        # first save of each turn of each campaign is recorded, in the directory of the campaign
+        first, second = SaveableGame(), SaveableGame()
+        second.campaign_id = "other"
+        for game in [first, first, second, first]:
+            assert persistency.save_game(game)
+        first.turn += 1
+        assert persistency.save_game(first)
+        assert recorded == [("campaign", 3), ("other", 3), ("campaign", 3), ("campaign", 4)], recorded
+        assert persistency.take_history_error() is None
+
+        # failed history is reported on its own and doesn't fail the save
+        first.turn += 1
+        first.budget = -1
+        assert persistency.save_game(first)
+        assert persistency.flush_saves() and persistency.last_save_error() is None
+        assert isinstance(persistency.take_history_error(), ValueError)
+        assert persistency.take_history_error() is None
+        assert persistency.restore_header().campaign_id == "campaign"
+    finally:
+        savehistory.SaveHistory.record = savehistory_record
+
+
+def execute_all():
+    f = io.BytesIO()
+    savefile.write(f, SaveableGame())
+
+    f.seek(0)
+    header = savefile.read_header(f)
+    assert not header.is_legacy
+    assert (header.game_version, header.theater, header.turn, header.budget) == ("1.5", "SaveableTheater", 3, 420), header
+
+    f.seek(0)
+    assert savefile.read(f).budget == 420
+
+    for codec in savefile.CODECS.keys():
+        f = io.BytesIO()
+        savefile.write(f, SaveableGame(), codec)
+
+        f.seek(0)
+        assert savefile.read_header(f).codec == codec
+        assert savefile.detect_codec(f.read()) == codec
+
+        f.seek(0)
+        assert savefile.read(f).budget == 420
+
+    legacy = io.BytesIO(pickle.dumps(SaveableGame()))
+    assert savefile.read_header(legacy).is_legacy
+    assert savefile.read(legacy).turn == 3
+
+    previous = {savejournal.SECTION_BUDGET: 100, savejournal.SECTION_CONTROLPOINTS: {0: (True, 1), 1: (False, 1)}, savejournal.SECTION_DEAD_OBJECTS: frozenset(["a"])}
+    current = {savejournal.SECTION_BUDGET: 90, savejournal.SECTION_CONTROLPOINTS: {0: (True, 1), 1: (False, 0.5)}, savejournal.SECTION_DEAD_OBJECTS: frozenset(["a", "b"])}
+    delta = savejournal.state_delta(previous, current)
+    assert delta == {savejournal.SECTION_BUDGET: 90, savejournal.SECTION_CONTROLPOINTS: {1: (False, 0.5)}, savejournal.SECTION_DEAD_OBJECTS: frozenset(["b"])}, delta
+    assert savejournal.state_delta(current, current) == {}
+
+    merged = savejournal.merge_deltas([delta, {savejournal.SECTION_BUDGET: 80, savejournal.SECTION_DEAD_OBJECTS: frozenset(["c"])}])
+    assert merged[savejournal.SECTION_BUDGET] == 80
+    assert merged[savejournal.SECTION_DEAD_OBJECTS] == frozenset(["b", "c"])
+
+    # catalog names are kept for each control point along with its inventory
+    merged = savejournal.merge_deltas([
+        {savejournal.SECTION_CONTROLPOINTS: {0: (True, 1), 1: (False, 1)}, savejournal.SECTION_CATALOG: {0: ("a", "b"), 1: ("a", "b")}},
+        {savejournal.SECTION_CONTROLPOINTS: {1: (False, 0.5)}, savejournal.SECTION_CATALOG: {1: ("b", "a")}},
+    ])
+    assert merged[savejournal.SECTION_CATALOG] == {0: ("a", "b"), 1: ("b", "a")}
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "journal")
+        with open(path, "wb") as f:
+            f.write(savejournal.JOURNAL_PREAMBLE.pack(savejournal.JOURNAL_MAGIC, 1.5))
+            f.write(savejournal.encode_record(delta))
+            f.write(savejournal.encode_record(delta)[:-1])
+
+        assert savejournal.read_journal(path, 2.5) is None
+        assert savejournal.read_journal(path, 1.5) == ([delta], False)
+
+        # failed background writes are kept until reported, a later successful write doesn't clear them
+        writer = SaveWriter()
+        writer.submit(os.path.join(directory, "missing", "save"), b"data")
+        writer.flush()
+        writer.submit(os.path.join(directory, "save"), b"data")
+        writer.flush()
+        assert isinstance(writer.take_error(), OSError)
+        assert writer.take_error() is None
+
+        # files are written in submission order, a replaced file moves behind the ones submitted before
+        written = []
+        write_atomic, append_durable = savewriter.write_atomic, savewriter.append_durable
+        savewriter.write_atomic = lambda path, data: written.append(os.path.basename(path))
+        savewriter.append_durable = lambda path, data: written.append(os.path.basename(path))
+        try:
+            with writer._condition:
+                writer.submit_append("journal", b"record")
+                writer.submit("save", b"snapshot")
+                writer.submit("journal", b"")
+                writer.submit("entry", b"")
+            writer.flush()
+        finally:
+            savewriter.write_atomic, savewriter.append_durable = write_atomic, append_durable
+
+        assert written == ["save", "journal", "entry"], written
+
+        # bodies are encoded on the writer thread, and only the latest one of coalesced requests
+        encoded = []
+        header = savefile.SaveHeader.from_game(SaveableGame(), savefile.CODEC_LZMA)
+
+        def encode(body: bytes) -> bytes:
+            encoded.append((body, threading.current_thread() is writer._thread))
+            return savefile.encode(header, body)
+
+        path = os.path.join(directory, "save")
+        game = SaveableGame()
+        with writer._condition:
+            writer.submit(path, savefile.pickle_game(game), encode)
+            game.budget = 840
+            writer.submit(path, savefile.pickle_game(game), encode)
+        writer.flush()
+
+        assert encoded == [(savefile.pickle_game(game), True)], encoded
+        with open(path, "rb") as f:
+            assert savefile.read_header(f).codec == savefile.CODEC_LZMA
+            assert savefile.loads_body(f.read()).budget == 840
+
+        writer.close()
+
+        check_history_per_campaign(directory)
+
+    print("savefile: ok")
+
+
+if __name__ == "__main__":
+    execute_all()
@@ -0,0 +1,78 @@
+import random
+
+from game import db
+
+ITERATIONS = 2000
+UNIT_TYPES = ["A", "B", "C", "D", "E"]
+
+
+def reference_unitdict_split(unit_dict, count):
+    buffer_dict = {}
+    for unit_type, unit_count in unit_dict.items():
+        for _ in range(unit_count):
+            db.unitdict_append(buffer_dict, unit_type, 1)
+            if sum(buffer_dict.values()) >= count:
+                yield buffer_dict
+                buffer_dict = {}
+
+    if len(buffer_dict):
+        yield buffer_dict
+
+
+def reference_unitdict_restrict_count(unit_dict, total_count):
+    if total_count == 0:
+        return {}
+
+    groups = list(reference_unitdict_split(unit_dict, total_count))
+    if len(groups) > 0:
+        return groups[0]
+    else:
+        return {}
+
+
+def reference_assignedunits_split_to_count(dict, count):
+    buffer_dict = {}
+    for unit_type, (unit_count, client_count) in dict.items():
+        for _ in range(unit_count):
+            new_count, new_client_count = buffer_dict.get(unit_type, (0, 0))
+
+            new_count += 1
+
+            if client_count > 0:
+                new_client_count += 1
+                client_count -= 1
+
+            buffer_dict[unit_type] = new_count, new_client_count
+            if new_count >= count:
+                yield buffer_dict
+                buffer_dict = {}
+
+    if len(buffer_dict):
+        yield buffer_dict
+
+
+def random_unitdict(rng: random.Random):
+    return {t: rng.randint(0, 30) for t in rng.sample(UNIT_TYPES, rng.randint(0, len(UNIT_TYPES)))}
+
+
+def random_count(rng: random.Random):
+    return rng.choice([rng.randint(-1, 12), rng.randint(0, 12) + 0.5])
+
+
+def execute_all(seed=0):
+    rng = random.Random(seed)
+    for _ in range(ITERATIONS):
+        unit_dict = random_unitdict(rng)
+        count = random_count(rng)
+
+        assert list(db.unitdict_split(unit_dict, count)) == list(reference_unitdict_split(unit_dict, count)), (unit_dict, count)
+        assert db.unitdict_restrict_count(unit_dict, count) == reference_unitdict_restrict_count(unit_dict, count), (unit_dict, count)
+
+        assigned_dict = {k: (v, rng.randint(-1, v + 2)) for k, v in unit_dict.items()}
+        assert list(db.assignedunits_split_to_count(assigned_dict, count)) == list(reference_assignedunits_split_to_count(assigned_dict, count)), (assigned_dict, count)
+
+    print("unitdict: {} cases ok".format(ITERATIONS))
+
+
+if __name__ == "__main__":
+    execute_all()
@@ -1,11 +1,15 @@
 from dcs.mission import Mission
 
+from userdata.debriefing import MissionManifest
 from game import *
 from game.event import *
 from game.db import *
 
 from theater.persiangulf import *
 from theater import start_generator
+import theater.base
+
+theater.base.CHECK_TOTALS_CONSISTENCY = True
 
 PLAYER_COUNTRY = None
 ENEMY_COUNTRY = None
@@ -40,20 +44,19 @@ class AutodebriefType(Enum):
 
 
 def autodebrief_for(event: Event, type: AutodebriefType) -> Debriefing:
-    mission = event.operation.current_mission  # type: Mission
+    manifest = event.operation.last_manifest  # type: MissionManifest
 
     countries = []
     if type == AutodebriefType.PLAYER_DEAD or type == AutodebriefType.EVERYONE_DEAD:
-        countries.append(mission.country(PLAYER_COUNTRY))
+        countries.append(PLAYER_COUNTRY)
 
     if type == AutodebriefType.ENEMY_DEAD or type == AutodebriefType.EVERYONE_DEAD:
-        countries.append(mission.country(ENEMY_COUNTRY))
+        countries.append(ENEMY_COUNTRY)
 
     dead_units = []
     for country in countries:
-        for group in country.plane_group + country.vehicle_group + country.helicopter_group:
-            for unit in group.units:
-                dead_units.append(str(unit.name))
+        for unit_id, _, _ in manifest.units[country]:
+            dead_units.append(unit_id)
 
     return Debriefing(dead_units, [])
 
@@ -1,6 +1,7 @@
 import logging
 import typing
 import math
+import array
 import itertools
 
 from dcs.planes import *
@@ -17,6 +18,16 @@ PLANES_SCRAMBLE_FACTOR = 0.3
 BASE_MAX_STRENGTH = 1
 BASE_MIN_STRENGTH = 0
 
+CATEGORY_AIRCRAFT = "aircraft"
+CATEGORY_ARMOR = "armor"
+CATEGORY_AA = "aa"
+
+# array.array typecode of the per-base inventory, indexed by db.UNIT_ID_BY_TYPE
+INVENTORY_TYPECODE = "i"
+
+# verify running unit totals against the inventory after every change (used by tests)
+CHECK_TOTALS_CONSISTENCY = False
+
 
 class Base:
     aircraft = {}  # type: typing.Dict[PlaneType, int]
@@ -31,24 +42,111 @@ class Base:
         self.aa = {}
         self.commision_points = {}
         self.strength = 1
+        self._reset_totals()
+
+    def __getstate__(self):
+        # unit dicts and totals are rebuilt from the inventory array on load
+        return {
+            "strength": self.strength,
+            "commision_points": {k: v for k, v in self.commision_points.items() if v},
+            "inventory": self.inventory_array(),
+            # catalog names are the same object for every base, so pickle stores them only once per save
+            "inventory_catalog": db.UNIT_CATALOG_NAMES,
+        }
+
+    def __setstate__(self, state):
+        state = state.copy()
+        inventory = state.pop("inventory", None)
+        inventory_catalog = state.pop("inventory_catalog", None)
+        self.__dict__.update(state)
+
+        if inventory is not None:
+            self.load_inventory_array(inventory, inventory_catalog)
+        elif "_task_totals" not in state:
+            self._reset_totals()
+
+    def inventory_array(self) -> array.array:
+        inventory = array.array(INVENTORY_TYPECODE, bytes(array.array(INVENTORY_TYPECODE).itemsize * len(db.UNIT_CATALOG)))
+        for unit_type, count in self.all_units:
+            inventory[db.UNIT_ID_BY_TYPE[unit_type]] += count
+
+        return inventory
+
+    def load_inventory_array(self, inventory: typing.Sequence[int], catalog: typing.Sequence[str] = None):
+        if catalog is None or catalog == db.UNIT_CATALOG_NAMES:
+            unit_types = db.UNIT_CATALOG
+        else:
+            # inventory was written with a different unit catalog; resolve ids by unit name
+            catalog_index = {name: unit_id for unit_id, name in enumerate(db.UNIT_CATALOG_NAMES)}
+            unit_types = [name in catalog_index and db.UNIT_CATALOG[catalog_index[name]] or None for name in catalog]
+
+        self.aircraft = {}
+        self.armor = {}
+        self.aa = {}
+        self._reset_totals()
+
+        units = {}
+        for unit_type, count in zip(unit_types, inventory):
+            if not count:
+                continue
+
+            if unit_type is None:
+                logging.warning("{}: dropping {} units missing from the unit catalog".format(self, count))
+                continue
+
+            units[unit_type] = count
+
+        if units:
+            self.commision_units(units)
+
+    def _reset_totals(self):
+        self._task_totals = {}  # type: typing.Dict[Task, int]
+        self._category_totals = {}  # type: typing.Dict[str, int]
+        for category, units in self._categories():
+            for unit_type, count in units.items():
+                self._adjust_totals(category, unit_type, count)
+
+    def _categories(self) -> typing.Collection[typing.Tuple[str, typing.Dict]]:
+        return [(CATEGORY_AIRCRAFT, self.aircraft), (CATEGORY_ARMOR, self.armor), (CATEGORY_AA, self.aa)]
+
+    def _adjust_totals(self, category: str, unit_type, delta: int):
+        task = db.TASK_BY_UNIT.get(unit_type)
+        self._task_totals[task] = self._task_totals.get(task, 0) + delta
+        self._category_totals[category] = self._category_totals.get(category, 0) + delta
+
+    def check_totals(self):
+        task_totals = {}
+        category_totals = {}
+        for category, units in self._categories():
+            for unit_type, count in units.items():
+                task = db.TASK_BY_UNIT.get(unit_type)
+                task_totals[task] = task_totals.get(task, 0) + count
+                category_totals[category] = category_totals.get(category, 0) + count
+
+        assert {k: v for k, v in self._task_totals.items() if v} == task_totals, "{}: task totals are out of sync".format(self)
+        assert {k: v for k, v in self._category_totals.items() if v} == category_totals, "{}: category totals are out of sync".format(self)
+
+    def _after_update(self):
+        if CHECK_TOTALS_CONSISTENCY:
+            self.check_totals()
 
     @property
     def total_planes(self) -> int:
-        return sum(self.aircraft.values())
+        return self._category_totals.get(CATEGORY_AIRCRAFT, 0)
 
     @property
     def total_armor(self) -> int:
-        return sum(self.armor.values())
+        return self._category_totals.get(CATEGORY_ARMOR, 0)
 
     @property
     def total_aa(self) -> int:
-        return sum(self.aa.values())
+        return self._category_totals.get(CATEGORY_AA, 0)
 
     def total_units(self, task: Task) -> int:
-        return sum([c for t, c in itertools.chain(self.aircraft.items(), self.armor.items(), self.aa.items()) if t in db.UNIT_BY_TASK[task]])
+        return self._task_totals.get(task, 0)
 
     def total_units_of_type(self, unit_type) -> int:
-        return sum([c for t, c in itertools.chain(self.aircraft.items(), self.armor.items(), self.aa.items()) if t == unit_type])
+        return self.aircraft.get(unit_type, 0) + self.armor.get(unit_type, 0) + self.aa.get(unit_type, 0)
 
     @property
     def all_units(self):
@@ -59,18 +157,15 @@ class Base:
             logging.warning("{}: no units for {}".format(self, for_type))
             return {}
 
-        sorted_units = [key for key in dict.keys() if key in db.UNIT_BY_TASK[for_type]]
-        sorted_units.sort(key=lambda x: db.PRICES[x], reverse=True)
-
         result = {}
-        for unit_type in sorted_units:
-            existing_count = dict[unit_type]  # type: int
-            if not existing_count:
-                continue
-
+        for unit_type in db.PRICE_RANKING_OF_TASK[for_type]:
             if count <= 0:
                 break
 
+            existing_count = dict.get(unit_type)  # type: int
+            if not existing_count:
+                continue
+
             result_unit_count = min(count, existing_count)
             count -= result_unit_count
 
@@ -96,8 +191,14 @@ class Base:
         return 0
 
     def filter_units(self, applicable_units: typing.Collection):
+        for category, units in [(CATEGORY_AIRCRAFT, self.aircraft), (CATEGORY_ARMOR, self.armor)]:
+            for unit_type, count in units.items():
+                if unit_type not in applicable_units:
+                    self._adjust_totals(category, unit_type, -count)
+
         self.aircraft = {k: v for k, v in self.aircraft.items() if k in applicable_units}
         self.armor = {k: v for k, v in self.armor.items() if k in applicable_units}
+        self._after_update()
 
     def commision_units(self, units: typing.Dict[typing.Any, int]):
         for value in units.values():
@@ -110,22 +211,31 @@ class Base:
             target_dict = None
             if for_task == CAS or for_task == CAP or for_task == Embarking:
                 target_dict = self.aircraft
+                category = CATEGORY_AIRCRAFT
             elif for_task == PinpointStrike:
                 target_dict = self.armor
+                category = CATEGORY_ARMOR
             elif for_task == AirDefence:
                 target_dict = self.aa
+                category = CATEGORY_AA
 
             assert target_dict is not None
             target_dict[unit_type] = target_dict.get(unit_type, 0) + unit_count
+            self._adjust_totals(category, unit_type, unit_count)
+
+        self._after_update()
 
     def commit_losses(self, units_lost: typing.Dict[typing.Any, int]):
         for unit_type, count in units_lost.items():
             if unit_type in self.aircraft:
                 target_array = self.aircraft
+                category = CATEGORY_AIRCRAFT
             elif unit_type in self.armor:
                 target_array = self.armor
+                category = CATEGORY_ARMOR
             elif unit_type in self.aa:
                 target_array = self.aa
+                category = CATEGORY_AA
             else:
                 print("Base didn't find event type {}".format(unit_type))
                 continue
@@ -134,10 +244,14 @@ class Base:
                 print("Base didn't find event type {}".format(unit_type))
                 continue
                 
-            target_array[unit_type] = max(target_array[unit_type] - count, 0)
+            remaining_count = max(target_array[unit_type] - count, 0)
+            self._adjust_totals(category, unit_type, remaining_count - target_array[unit_type])
+            target_array[unit_type] = remaining_count
             if target_array[unit_type] == 0:
                 del target_array[unit_type]
 
+        self._after_update()
+
     def affect_strength(self, amount):
         self.strength += amount
         if self.strength > BASE_MAX_STRENGTH:
@@ -147,7 +261,7 @@ class Base:
 
     def scramble_count(self, multiplier: float, task: Task = None) -> int:
         if task:
-            count = sum([v for k, v in self.aircraft.items() if db.unit_task(k) == task])
+            count = self.total_units(task)
         else:
             count = self.total_planes
 
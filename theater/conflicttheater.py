@@ -7,6 +7,8 @@ from dcs.mapping import Point
 from .landmap import Landmap, poly_contains
 from .controlpoint import ControlPoint
 from .theatergroundobject import TheaterGroundObject
+from .groundobjectstore import GroundObjectStore
+from .inventory import InventoryMatrix
 
 SIZE_TINY = 150
 SIZE_SMALL = 600
@@ -58,6 +60,15 @@ class ConflictTheater:
     """
     daytime_map = None  # type: typing.Dict[str, typing.Tuple[int, int]]
 
+    _ground_object_index = None  # type: typing.Dict[str, typing.List[int]]
+    _ground_object_store = None  # type: GroundObjectStore
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, value in vars(cls).items():
+            if isinstance(value, ControlPoint):
+                value.theater_key = (cls.__module__, cls.__name__, name)
+
     def __init__(self):
         self.controlpoints = []
         """
@@ -72,6 +83,104 @@ class ConflictTheater:
 
         self.controlpoints.append(point)
 
+    def __getstate__(self):
+        # terrain, landmap and the like are class level, control points pickle only their campaign state
+        # connections are stored by index, ids aren't unique (every carrier has id 0)
+        indices = {id(cp): index for index, cp in enumerate(self.controlpoints)}
+        return {
+            "controlpoints": self.controlpoints,
+            "connections": [[indices[id(x)] for x in cp.connected_points if id(x) in indices] for cp in self.controlpoints],
+            "_ground_object_store": self._ground_object_store,
+        }
+
+    def __setstate__(self, state):
+        state = state.copy()
+        connections = state.pop("connections", None)
+        self.__dict__.update(state)
+        self._ground_object_index = None
+
+        if connections is not None:
+            for cp, connected_indices in zip(self.controlpoints, connections):
+                cp.connected_points = [self.controlpoints[index] for index in connected_indices]
+
+        # restored control points are copies of the class level ones, instance attributes shadow the latter
+        for cp in self.controlpoints:
+            if cp.theater_key is not None:
+                setattr(self, cp.theater_key[2], cp)
+
+    @property
+    def ground_object_index(self) -> typing.Dict[str, typing.List[int]]:
+        # store rows of alive ground objects by string identifier (objects of multi-unit groups can share one);
+        # rebuilt lazily on load from the store columns, without materializing the objects
+        if self._ground_object_index is None:
+            self._ground_object_index = {}
+            for row, string_identifier in self.ground_object_identifiers(alive=True):
+                self._ground_object_index.setdefault(string_identifier, []).append(row)
+
+        return self._ground_object_index
+
+    def _ground_object_rows(self) -> typing.Iterator[int]:
+        # store rows of the ground objects of all control points; objects that aren't in the store yet are bound to it
+        store = self.ground_object_store
+        for cp in self.controlpoints:
+            store_rows = cp.ground_object_store_rows()
+            if store_rows is not None and store_rows[0] is store:
+                yield from store_rows[1]
+            else:
+                for ground_object in cp.ground_objects:
+                    yield store.bind(ground_object)
+
+    def ground_object_identifiers(self, alive: bool = None) -> typing.Iterator[typing.Tuple[int, str]]:
+        # (store row, string identifier) of the ground objects of all control points
+        return self.ground_object_store.string_identifiers(self._ground_object_rows(), alive)
+
+    @property
+    def ground_object_store(self) -> GroundObjectStore:
+        # columnar storage of all ground objects; existing objects are bound on first use for saves made without it
+        if self._ground_object_store is None:
+            self._ground_object_store = GroundObjectStore()
+            for cp in self.controlpoints:
+                for ground_object in cp.ground_objects:
+                    self._ground_object_store.bind(ground_object)
+
+        return self._ground_object_store
+
+    def add_ground_object(self, cp: ControlPoint, ground_object: TheaterGroundObject):
+        # index is built before the object is added, so a lazy rebuild doesn't list it twice
+        index = self.ground_object_index
+        row = self.ground_object_store.bind(ground_object)
+        cp.ground_objects.append(ground_object)
+        cp.invalidate_strike_target_groups()
+        if not ground_object.is_dead:
+            index.setdefault(ground_object.string_identifier, []).append(row)
+
+    def clear_ground_objects(self, cp: ControlPoint):
+        for ground_object in cp.ground_objects:
+            self._unindex_ground_object(ground_object)
+            # rows are never removed from the store, so dropped objects are only excluded from alive queries
+            ground_object.is_dead = True
+
+        cp.ground_objects = []
+        cp.invalidate_strike_target_groups()
+
+    def _unindex_ground_object(self, ground_object: TheaterGroundObject):
+        string_identifier = ground_object.string_identifier
+        rows = self.ground_object_index.get(string_identifier, [])
+        rows[:] = [x for x in rows if not (ground_object._store is self.ground_object_store and x == ground_object._row)]
+        if not rows:
+            self.ground_object_index.pop(string_identifier, None)
+
+    def find_ground_objects(self, string_identifier: str) -> typing.List[TheaterGroundObject]:
+        store = self.ground_object_store
+        return [store.object(row) for row in self.ground_object_index.get(string_identifier, [])]
+
+    def kill_ground_object(self, ground_object: TheaterGroundObject):
+        ground_object.is_dead = True
+        self._unindex_ground_object(ground_object)
+        for cp in self.controlpoints:
+            if cp.id == ground_object.cp_id:
+                cp.invalidate_strike_target_groups()
+
     def is_in_sea(self, point: Point) -> bool:
         if not self.landmap:
             return False
@@ -110,3 +219,6 @@ class ConflictTheater:
 
     def enemy_points(self) -> typing.Collection[ControlPoint]:
         return [point for point in self.controlpoints if not point.captured]
+
+    def inventory_matrix(self) -> InventoryMatrix:
+        return InventoryMatrix.from_theater(self)
@@ -1,11 +1,30 @@
+import array
 import typing
+import importlib
 import re
 
 from dcs.mapping import *
 from dcs.country import *
 from dcs.terrain import Airport
 
-from .theatergroundobject import TheaterGroundObject
+from .theatergroundobject import TheaterGroundObject, StrikeTargetGroup
+
+
+def theater_controlpoints(module: str, theater_name: str) -> typing.Dict[str, "ControlPoint"]:
+    theater_class = getattr(importlib.import_module(module), theater_name)
+    return {name: value for name, value in vars(theater_class).items() if isinstance(value, ControlPoint)}
+
+
+def _restore_controlpoint(module: str, theater_name: str, attribute: str) -> "ControlPoint":
+    # static data (airport, position, radials, etc.) is shared with the control point declared on the theater class,
+    # campaign state is set afterwards on the copy, so the class object and games built on it are left untouched
+    template = theater_controlpoints(module, theater_name)[attribute]
+    cp = ControlPoint.__new__(ControlPoint)
+    cp.__dict__.update(template.__dict__)
+    # connections are restored by the theater, by index of the control point
+    cp.connected_points = []
+    cp.ground_objects = []
+    return cp
 
 
 class ControlPoint:
@@ -17,12 +36,18 @@ class ControlPoint:
     at = None  # type: db.StartPosition
 
     connected_points = None  # type: typing.List[ControlPoint]
-    ground_objects = None  # type: typing.List[TheaterGroundObject]
+    _ground_objects = None  # type: typing.List[TheaterGroundObject]
+    # (store, rows) of ground objects not yet materialized after a load
+    _ground_object_rows = None  # type: typing.Tuple[theater.groundobjectstore.GroundObjectStore, array.array]
+    _strike_target_groups = None  # type: typing.List[StrikeTargetGroup]
 
     captured = False
     has_frontline = True
     frontline_offset = 0.0
 
+    # (module, theater class name, attribute name) for control points declared on a theater class
+    theater_key = None  # type: typing.Tuple[str, str, str]
+
     def __init__(self, id: int, name: str, position: Point, at, radials: typing.Collection[int], size: int, importance: float, has_frontline=True):
         import theater.base
 
@@ -54,6 +79,46 @@ class ControlPoint:
     def __str__(self):
         return self.name
 
+    def __reduce_ex__(self, protocol):
+        if self.theater_key is None:
+            return super(ControlPoint, self).__reduce_ex__(protocol)
+
+        return _restore_controlpoint, self.theater_key, self.__getstate__()
+
+    def __getstate__(self):
+        if self.theater_key is None:
+            state = self.__dict__.copy()
+            state.pop("_strike_target_groups", None)
+            return state
+
+        state = {
+            "name": self.name,
+            "captured": self.captured,
+            "frontline_offset": self.frontline_offset,
+            "base": self.base,
+        }
+
+        ground_object_rows = self.ground_object_store_rows()
+        if ground_object_rows is not None:
+            state["ground_object_rows"] = ground_object_rows
+        else:
+            state["ground_objects"] = self._ground_objects
+
+        return state
+
+    def __setstate__(self, state):
+        state = state.copy()
+        ground_objects = state.pop("ground_objects", None)
+        ground_object_rows = state.pop("ground_object_rows", None)
+        self.__dict__.update(state)
+        self._strike_target_groups = None
+
+        if ground_object_rows is not None:
+            self._ground_objects = None
+            self._ground_object_rows = ground_object_rows
+        elif ground_objects is not None:
+            self.ground_objects = ground_objects
+
     @property
     def is_global(self):
         return not self.connected_points
@@ -68,6 +133,42 @@ class ControlPoint:
                 result.append(r)
         return result
 
+    @property
+    def ground_objects(self) -> typing.List[TheaterGroundObject]:
+        if self._ground_objects is None and self._ground_object_rows is not None:
+            store, rows = self._ground_object_rows
+            self._ground_objects = [store.object(row) for row in rows]
+            self._ground_object_rows = None
+
+        return self._ground_objects
+
+    def ground_object_store_rows(self) -> typing.Optional[typing.Tuple["theater.groundobjectstore.GroundObjectStore", array.array]]:
+        # (store, rows) of the ground objects without materializing them, None unless all are bound to a single store
+        if self._ground_objects is None:
+            return self._ground_object_rows
+
+        stores = set(id(x._store) for x in self._ground_objects)
+        if self._ground_objects and len(stores) == 1 and self._ground_objects[0].is_bound:
+            return self._ground_objects[0]._store, array.array("i", [x._row for x in self._ground_objects])
+
+        return None
+
+    @ground_objects.setter
+    def ground_objects(self, value: typing.List[TheaterGroundObject]):
+        self._ground_objects = value
+        self._ground_object_rows = None
+
+    @property
+    def strike_target_groups(self) -> typing.List[StrikeTargetGroup]:
+        # ground object groups in generation order; cache is dropped by the theater when ground objects change or die
+        if self._strike_target_groups is None:
+            self._strike_target_groups = StrikeTargetGroup.from_ground_objects(self.ground_objects)
+
+        return self._strike_target_groups
+
+    def invalidate_strike_target_groups(self):
+        self._strike_target_groups = None
+
     def connect(self, to):
         self.connected_points.append(to)
 
@@ -0,0 +1,205 @@
+import array
+import collections
+import itertools
+import typing
+
+from dcs.mapping import Point
+
+from .theatergroundobject import TheaterGroundObject, CATEGORY_BY_IDENTIFIER, CATEGORY_IDS, CATEGORY_NAMES
+
+COLUMNS = [
+    ("cp_id", "i"),
+    ("group_id", "i"),
+    ("object_id", "i"),
+    ("category_id", "b"),
+    ("type_id", "h"),
+    ("x", "d"),
+    ("y", "d"),
+    ("heading", "d"),
+    ("alive", "b"),
+]
+
+
+class GroundObjectStore:
+    """
+    Theater-wide columnar storage of ground objects. Every bound TheaterGroundObject is a view onto one row,
+    which lets queries run over the plain columns and saves pickle them as raw arrays.
+
+    Loaded stores are hydrated lazily: columns are decoded on first access and row views are created
+    when something asks for them, so loading a save doesn't depend on the amount of ground objects.
+    """
+
+    type_identifiers = None  # type: typing.List[str]
+
+    def __init__(self):
+        self._columns = {name: array.array(typecode) for name, typecode in COLUMNS}
+        self._raw_columns = None  # type: typing.Dict[str, bytes]
+        self._objects = []  # type: typing.List[typing.Optional[TheaterGroundObject]]
+        self.type_identifiers = []
+
+    def __getstate__(self):
+        if self._raw_columns is not None:
+            # never hydrated since the load, so the columns are saved as they were loaded
+            raw_columns = self._raw_columns
+        else:
+            raw_columns = {name: column.tobytes() for name, column in self._columns.items()}
+
+        return {
+            "columns": raw_columns,
+            "type_identifiers": self.type_identifiers,
+            "count": len(self._objects),
+        }
+
+    def __setstate__(self, state):
+        self.type_identifiers = state["type_identifiers"]
+        self._columns = None
+        self._raw_columns = state["columns"]
+        self._objects = [None] * state["count"]
+
+    def __len__(self):
+        return len(self._objects)
+
+    @property
+    def is_hydrated(self) -> bool:
+        return self._columns is not None
+
+    @property
+    def columns(self) -> typing.Dict[str, array.array]:
+        if self._columns is None:
+            columns = {}
+            for name, typecode in COLUMNS:
+                column = array.array(typecode)
+                column.frombytes(self._raw_columns[name])
+                columns[name] = column
+
+            self._columns = columns
+            self._raw_columns = None
+
+        return self._columns
+
+    def object(self, row: int) -> TheaterGroundObject:
+        ground_object = self._objects[row]
+        if ground_object is None:
+            ground_object = TheaterGroundObject()
+            ground_object.bind(self, row)
+            self._objects[row] = ground_object
+
+        return ground_object
+
+    def markers(self, rows: typing.Iterable[int]) -> typing.Iterator[typing.Tuple[int, Point, typing.Optional[str], bool]]:
+        # (row, position, category, is_dead) read straight from the columns, without building the row views
+        columns = self.columns
+        x_column, y_column = columns["x"], columns["y"]
+        category_column, alive_column = columns["category_id"], columns["alive"]
+        for row in rows:
+            category_id = category_column[row]
+            category = CATEGORY_NAMES[category_id] if category_id >= 0 else None
+            yield row, Point(x_column[row], y_column[row]), category, not alive_column[row]
+
+    def string_identifiers(self, rows: typing.Iterable[int], alive: bool = None) -> typing.Iterator[typing.Tuple[int, str]]:
+        # (row, string identifier) read straight from the columns, same as TheaterGroundObject.string_identifier
+        columns = self.columns
+        cp_column, group_column, object_column = columns["cp_id"], columns["group_id"], columns["object_id"]
+        category_column, alive_column = columns["category_id"], columns["alive"]
+        for row in rows:
+            if alive is not None and bool(alive_column[row]) != alive:
+                continue
+
+            category_id = category_column[row]
+            assert category_id >= 0, "Identifier not found in mapping: {}".format(self.type_identifiers[columns["type_id"][row]])
+            yield row, "{}|{}|{}|{}".format(CATEGORY_NAMES[category_id], cp_column[row], group_column[row], object_column[row])
+
+    def rows(self, category: str = None, cp_id: int = None, alive: bool = True) -> typing.Iterator[int]:
+        # filters are combined column-wise, so rows are only visited in Python once they match all of them
+        columns = self.columns
+        masks = []
+        if alive:
+            masks.append(columns["alive"])
+        if category is not None:
+            masks.append(map(CATEGORY_IDS[category].__eq__, columns["category_id"]))
+        if cp_id is not None:
+            masks.append(map(cp_id.__eq__, columns["cp_id"]))
+
+        if not masks:
+            return iter(range(len(self._objects)))
+
+        mask = masks[0] if len(masks) == 1 else map(all, zip(*masks))
+        return itertools.compress(range(len(self._objects)), mask)
+
+    def find(self, category: str = None, cp_id: int = None, alive: bool = True) -> typing.List[TheaterGroundObject]:
+        return [self.object(row) for row in self.rows(category, cp_id, alive)]
+
+    def within(self, point: Point, distance: float, category: str = None, cp_id: int = None, alive: bool = True) -> typing.List[TheaterGroundObject]:
+        x_column, y_column = self.columns["x"], self.columns["y"]
+        max_distance = distance * distance
+        return [self.object(row) for row in self.rows(category, cp_id, alive)
+                if (x_column[row] - point.x) ** 2 + (y_column[row] - point.y) ** 2 <= max_distance]
+
+    def count_by_category(self, alive: bool = True) -> typing.Dict[typing.Tuple[int, typing.Optional[str]], int]:
+        # (cp id, category) -> object count
+        columns = self.columns
+        cp_column, category_column = columns["cp_id"], columns["category_id"]
+        if alive:
+            cp_column = itertools.compress(cp_column, columns["alive"])
+            category_column = itertools.compress(category_column, columns["alive"])
+
+        counts = collections.Counter(zip(cp_column, category_column))
+        return {(cp_id, CATEGORY_NAMES[category_id] if category_id >= 0 else None): count for (cp_id, category_id), count in counts.items()}
+
+    @property
+    def objects(self) -> typing.List[TheaterGroundObject]:
+        return [self.object(row) for row in range(len(self._objects))]
+
+    def materialized_objects(self) -> typing.Iterator[typing.Tuple[int, TheaterGroundObject]]:
+        for row, ground_object in enumerate(self._objects):
+            if ground_object is not None:
+                yield row, ground_object
+
+    def _type_id(self, dcs_identifier: str) -> int:
+        if dcs_identifier not in self.type_identifiers:
+            self.type_identifiers.append(dcs_identifier)
+
+        return self.type_identifiers.index(dcs_identifier)
+
+    def set_type(self, row: int, dcs_identifier: str):
+        category = CATEGORY_BY_IDENTIFIER.get(dcs_identifier)
+        self.columns["type_id"][row] = self._type_id(dcs_identifier)
+        self.columns["category_id"][row] = CATEGORY_IDS[category] if category else -1
+
+    def release(self, row: int):
+        # row of an object moved to another store; rows are never removed, so it is only excluded from alive rows
+        self.columns["alive"][row] = 0
+        self._objects[row] = None
+
+    def bind(self, ground_object: TheaterGroundObject) -> int:
+        if ground_object._store is self:
+            return ground_object._row
+
+        # values are read through the object, so objects bound to another store are moved over
+        previous_store, previous_row = ground_object._store, ground_object._row
+        position = ground_object.position
+        dcs_identifier = ground_object.dcs_identifier
+        category = CATEGORY_BY_IDENTIFIER.get(dcs_identifier)
+        values = {
+            "cp_id": ground_object.cp_id,
+            "group_id": ground_object.group_id,
+            "object_id": ground_object.object_id,
+            "category_id": CATEGORY_IDS[category] if category else -1,
+            "type_id": self._type_id(dcs_identifier),
+            "x": position.x if position else 0,
+            "y": position.y if position else 0,
+            "heading": ground_object.heading,
+            "alive": 0 if ground_object.is_dead else 1,
+        }
+
+        row = len(self._objects)
+        columns = self.columns
+        for name, _ in COLUMNS:
+            columns[name].append(values[name])
+
+        self._objects.append(ground_object)
+        ground_object.bind(self, row)
+        if previous_store is not None:
+            previous_store.release(previous_row)
+
+        return row
@@ -0,0 +1,70 @@
+import array
+import typing
+
+from dcs.task import Task
+from dcs.unittype import UnitType
+
+from game import db
+
+from .controlpoint import ControlPoint
+
+
+class InventoryMatrix:
+    """
+    Theater-wide bases x unit types matrix built from `Base.inventory_array`. Row order follows
+    `controlpoints`, column index is the dense unit id from `db.UNIT_ID_BY_TYPE`.
+    """
+
+    controlpoints = None  # type: typing.List[ControlPoint]
+    rows = None  # type: typing.List[array.array]
+
+    def __init__(self, controlpoints: typing.Collection[ControlPoint]):
+        self.controlpoints = list(controlpoints)
+        self.rows = [cp.base.inventory_array() for cp in self.controlpoints]
+
+    @classmethod
+    def from_theater(cls, theater) -> "InventoryMatrix":
+        return cls(theater.controlpoints)
+
+    def _side_rows(self, captured: bool = None) -> typing.Iterator[typing.Tuple[ControlPoint, array.array]]:
+        for cp, row in zip(self.controlpoints, self.rows):
+            if captured is None or cp.captured == captured:
+                yield cp, row
+
+    def column_totals(self, captured: bool = None) -> array.array:
+        totals = array.array("q", bytes(8 * len(db.UNIT_CATALOG)))
+        for _, row in self._side_rows(captured):
+            for unit_id, count in enumerate(row):
+                totals[unit_id] += count
+
+        return totals
+
+    def total_units(self, task: Task, captured: bool = None) -> int:
+        totals = self.column_totals(captured)
+        return sum(totals[unit_id] for unit_id in db.UNIT_IDS_OF_TASK[task])
+
+    def total_units_per_cp(self, task: Task, captured: bool = None) -> typing.Dict[ControlPoint, int]:
+        unit_ids = db.UNIT_IDS_OF_TASK[task]
+        return {cp: sum(row[unit_id] for unit_id in unit_ids) for cp, row in self._side_rows(captured)}
+
+    def cheapest_available(self, task: Task, captured: bool = None) -> typing.Optional[typing.Tuple[UnitType, ControlPoint]]:
+        totals = self.column_totals(captured)
+        available_ids = [x for x in db.UNIT_IDS_OF_TASK[task] if totals[x] > 0]
+        if not available_ids:
+            return None
+
+        unit_id = min(available_ids, key=lambda x: db.PRICES[db.UNIT_CATALOG[x]])
+        for cp, row in self._side_rows(captured):
+            if row[unit_id] > 0:
+                return db.UNIT_CATALOG[unit_id], cp
+
+        return None
+
+    def snapshot(self) -> typing.List[array.array]:
+        return [array.array(row.typecode, row) for row in self.rows]
+
+    def restore(self, snapshot: typing.List[array.array]):
+        assert len(snapshot) == len(self.controlpoints)
+        self.rows = [array.array(row.typecode, row) for row in snapshot]
+        for cp, row in zip(self.controlpoints, self.rows):
+            cp.base.load_inventory_array(row)
@@ -43,7 +43,7 @@ def generate_inital_units(theater: ConflictTheater, enemy: str, sams: bool, mult
                 cp.base.commision_units({unit_type: count_per_type})
 
 
-def generate_groundobjects(theater: ConflictTheater):
+def generate_groundobjects(theater: ConflictTheater, rng: random.Random = random):
     with open("resources/groundobject_templates.p", "rb") as f:
         tpls = pickle.load(f)
 
@@ -79,15 +79,15 @@ def generate_groundobjects(theater: ConflictTheater):
         if not cp.has_frontline:
             continue
 
-        amount = random.randrange(5, 7)
+        amount = rng.randrange(5, 7)
         for i in range(0, amount):
             available_categories = list(tpls)
             if i >= amount - 1:
                 tpl_category = "aa"
             else:
-                tpl_category = random.choice(available_categories)
+                tpl_category = rng.choice(available_categories)
 
-            tpl = random.choice(list(tpls[tpl_category].values()))
+            tpl = rng.choice(list(tpls[tpl_category].values()))
 
             point = find_location(tpl_category != "oil", cp.position, theater, 15000, 80000)
 
@@ -111,4 +111,4 @@ def generate_groundobjects(theater: ConflictTheater):
                 g.heading = object["heading"]
                 g.position = Point(point.x + object["offset"].x, point.y + object["offset"].y)
 
-                cp.ground_objects.append(g)
+                theater.add_ground_object(cp, g)
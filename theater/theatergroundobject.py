@@ -44,23 +44,146 @@ CATEGORY_MAP = {
 }
 
 
+# reversed so the first category listed in CATEGORY_MAP wins for the identifier
+CATEGORY_BY_IDENTIFIER = {identifier: category for category, identifiers in reversed(list(CATEGORY_MAP.items())) for identifier in identifiers}
+CATEGORY_IDS = {category: category_id for category_id, category in enumerate(CATEGORY_MAP.keys())}
+CATEGORY_NAMES = list(CATEGORY_MAP.keys())
+
+
+class _StoreField:
+    """
+    Attribute that is kept on the object itself until it is bound to a GroundObjectStore,
+    and is read from / written to the store column afterwards.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.slot = "_" + name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        if instance._store is None:
+            return getattr(instance, self.slot)
+        else:
+            return instance._store.columns[self.name][instance._row]
+
+    def __set__(self, instance, value):
+        if instance._store is None:
+            setattr(instance, self.slot, value)
+        else:
+            instance._store.columns[self.name][instance._row] = value
+
+
 class TheaterGroundObject:
-    cp_id = 0
-    group_id = 0
-    object_id = 0
+    __slots__ = ("_cp_id", "_group_id", "_object_id", "_dcs_identifier", "_category", "_is_dead", "_heading", "_position", "_store", "_row")
+
+    cp_id = _StoreField("cp_id")
+    group_id = _StoreField("group_id")
+    object_id = _StoreField("object_id")
+    heading = _StoreField("heading")
+
+    def __init__(self):
+        self._store = None  # type: theater.groundobjectstore.GroundObjectStore
+        self._row = -1
+
+        self._cp_id = 0
+        self._group_id = 0
+        self._object_id = 0
+
+        self._dcs_identifier = None  # type: str
+        self._category = None  # type: str
+        self._is_dead = False
+
+        self._heading = 0
+        self._position = None  # type: Point
+
+    def __reduce_ex__(self, protocol):
+        if self._store is not None:
+            # store is pickled once per save, bound objects are resolved to the store row view on load
+            return _store_object, (self._store, self._row)
+
+        return super(TheaterGroundObject, self).__reduce_ex__(protocol)
+
+    def __getstate__(self):
+        if self._store is not None:
+            return self._store, self._row
+
+        return self._cp_id, self._group_id, self._object_id, self._dcs_identifier, self._is_dead, self._heading, self._position
+
+    def __setstate__(self, state):
+        self.__init__()
+        if isinstance(state, dict):
+            # ground object templates and saves pickled before slots were introduced
+            for key, value in state.items():
+                setattr(self, key, value)
+        elif len(state) == 2:
+            self._store, self._row = state
+        else:
+            self.cp_id, self.group_id, self.object_id, self.dcs_identifier, self.is_dead, self.heading, self.position = state
+
+    @property
+    def is_bound(self) -> bool:
+        return self._store is not None
+
+    def bind(self, store, row: int):
+        self._store = store
+        self._row = row
+
+    @property
+    def dcs_identifier(self) -> str:
+        if self._store is None:
+            return self._dcs_identifier
+        else:
+            return self._store.type_identifiers[self._store.columns["type_id"][self._row]]
 
-    dcs_identifier = None  # type: str
-    is_dead = False
+    @dcs_identifier.setter
+    def dcs_identifier(self, value: str):
+        if self._store is None:
+            self._dcs_identifier = value
+            self._category = CATEGORY_BY_IDENTIFIER.get(value)
+        else:
+            self._store.set_type(self._row, value)
 
-    heading = 0
-    position = None  # type: Point
+    @property
+    def is_dead(self) -> bool:
+        if self._store is None:
+            return self._is_dead
+        else:
+            return not self._store.columns["alive"][self._row]
+
+    @is_dead.setter
+    def is_dead(self, value: bool):
+        if self._store is None:
+            self._is_dead = value
+        else:
+            self._store.columns["alive"][self._row] = 0 if value else 1
+
+    @property
+    def position(self) -> Point:
+        if self._store is not None and self._position is None:
+            self._position = Point(self._store.columns["x"][self._row], self._store.columns["y"][self._row])
+
+        return self._position
+
+    @position.setter
+    def position(self, value: Point):
+        self._position = value
+        if self._store is not None:
+            self._store.columns["x"][self._row] = value.x
+            self._store.columns["y"][self._row] = value.y
 
     @property
     def category(self) -> str:
-        for k, v in CATEGORY_MAP.items():
-            if self.dcs_identifier in v:
-                return k
-        assert False, "Identifier not found in mapping: {}".format(self.dcs_identifier)
+        if self._store is None:
+            category = self._category
+        else:
+            category_id = self._store.columns["category_id"][self._row]
+            category = category_id >= 0 and CATEGORY_NAMES[category_id] or None
+
+        assert category, "Identifier not found in mapping: {}".format(self.dcs_identifier)
+        return category
 
     @property
     def string_identifier(self):
@@ -79,3 +202,53 @@ class TheaterGroundObject:
 
     def matches_string_identifier(self, id):
         return self.string_identifier == id
+
+
+def _store_object(store, row: int) -> TheaterGroundObject:
+    return store.object(row)
+
+
+class StrikeTargetGroup:
+    """
+    Summary of a single ground object group of a control point, as targeted by strike operations.
+    """
+
+    __slots__ = ("group_identifier", "name", "category", "markpoint_name", "position", "objects", "alive_objects")
+
+    def __init__(self, group_identifier: str, category: str, markpoint_name: str, objects: typing.List[TheaterGroundObject]):
+        self.group_identifier = group_identifier
+        self.name = NAME_BY_CATEGORY[category]
+        self.category = category
+        self.markpoint_name = markpoint_name
+        self.objects = objects
+        self.alive_objects = len([x for x in objects if not x.is_dead])
+
+        positions = [x.position for x in objects]
+        self.position = Point(sum(p.x for p in positions) / len(positions), sum(p.y for p in positions) / len(positions))
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def is_aa(self) -> bool:
+        return self.category == "aa"
+
+    @property
+    def is_dead(self) -> bool:
+        return self.alive_objects == 0
+
+    @classmethod
+    def from_ground_objects(cls, ground_objects: typing.Collection[TheaterGroundObject]) -> typing.List["StrikeTargetGroup"]:
+        groups = {}  # type: typing.Dict[str, typing.List[TheaterGroundObject]]
+        for ground_object in ground_objects:
+            groups.setdefault(ground_object.group_identifier, []).append(ground_object)
+
+        result = []
+        category_counters = {}  # type: typing.Dict[str, int]
+        for group_identifier, objects in groups.items():
+            category = objects[0].category
+            category_counters[category] = category_counters.get(category, 0) + 1
+            markpoint_name = "{}{}".format(ABBREV_NAME[category], category_counters[category])
+            result.append(cls(group_identifier, category, markpoint_name, objects))
+
+        return result
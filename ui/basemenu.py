@@ -1,6 +1,7 @@
 from ui.eventmenu import *
 
 from game.game import *
+from userdata import persistency
 from .styles import STYLES
 
 
@@ -87,6 +88,11 @@ class BaseMenu(Menu):
 
         self.budget_label["text"] = "Budget: {}m".format(self.game.budget)
 
+    def _autosave(self):
+        # every purchase is saved only with incremental saves, since then the save is a small journal record
+        if self.game.settings.incremental_saves and not persistency.save_game(self.game):
+            self.window.report_save_error()
+
     def buy(self, unit_type):
         def action():
             price = db.PRICES[unit_type]
@@ -95,6 +101,7 @@ class BaseMenu(Menu):
                 self.game.budget -= price
 
             self._update_count_label(unit_type)
+            self._autosave()
 
         return action
 
@@ -112,5 +119,6 @@ class BaseMenu(Menu):
                 self.base.commit_losses({unit_type: 1})
 
             self._update_count_label(unit_type)
+            self._autosave()
 
         return action
\ No newline at end of file
@@ -36,6 +36,15 @@ class ConfigurationMenu(Menu):
         self.cold_start_var = BooleanVar()
         self.cold_start_var.set(self.game.settings.cold_start)
 
+        self.save_compression_var = StringVar()
+        self.save_compression_var.set(self.game.settings.save_compression)
+
+        self.incremental_saves_var = BooleanVar()
+        self.incremental_saves_var.set(self.game.settings.incremental_saves)
+
+        self.save_history_var = BooleanVar()
+        self.save_history_var.set(self.game.settings.save_history)
+
     def dismiss(self):
         self.game.settings.player_skill = self.player_skill_var.get()
         self.game.settings.enemy_skill = self.enemy_skill_var.get()
@@ -45,6 +54,9 @@ class ConfigurationMenu(Menu):
         self.game.settings.only_player_takeoff = self.takeoff_var.get()
         self.game.settings.night_disabled = self.night_var.get()
         self.game.settings.cold_start = self.cold_start_var.get()
+        self.game.settings.save_compression = self.save_compression_var.get()
+        self.game.settings.incremental_saves = self.incremental_saves_var.get()
+        self.game.settings.save_history = self.save_history_var.get()
         super(ConfigurationMenu, self).dismiss()
 
     def display(self):
@@ -104,6 +116,20 @@ class ConfigurationMenu(Menu):
         Checkbutton(body, variable=self.night_var, **STYLES["radiobutton"]).grid(row=row, column=1, sticky=E)
         row += 1
 
+        Label(body, text="Save compression", **STYLES["widget"]).grid(row=row, column=0, sticky=W)
+        s_compression = OptionMenu(body, self.save_compression_var, "none", "zlib", "lzma")
+        s_compression.grid(row=row, column=1, sticky=E)
+        s_compression.configure(**STYLES["btn-primary"])
+        row += 1
+
+        Label(body, text="Incremental saves", **STYLES["widget"]).grid(row=row, column=0, sticky=W)
+        Checkbutton(body, variable=self.incremental_saves_var, **STYLES["radiobutton"]).grid(row=row, column=1, sticky=E)
+        row += 1
+
+        Label(body, text="Keep save of every turn", **STYLES["widget"]).grid(row=row, column=0, sticky=W)
+        Checkbutton(body, variable=self.save_history_var, **STYLES["radiobutton"]).grid(row=row, column=1, sticky=E)
+        row += 1
+
         Label(body, text="Contributors: ", **STYLES["strong"]).grid(row=row, column=0, columnspan=2, sticky=EW)
         row += 1
 
@@ -5,6 +5,9 @@ from game.game import *
 from userdata.debriefing import *
 from .styles import STYLES
 
+# ms between checks for a parsed debriefing handed over by the watcher thread
+DEBRIEFING_DISPATCH_INTERVAL = 250
+
 
 class EventResultsMenu(Menu):
     debriefing = None  # type: Debriefing
@@ -18,7 +21,16 @@ class EventResultsMenu(Menu):
         self.event = event
         self.finished = False
 
-        wait_for_debriefing(callback=self.process_debriefing)
+        self.debriefing_waiter = wait_for_debriefing(callback=self.process_debriefing)
+        self.window.tk.after(DEBRIEFING_DISPATCH_INTERVAL, self.dispatch_debriefing)
+
+    def dispatch_debriefing(self):
+        if self.finished:
+            self.debriefing_waiter.cancel()
+            return
+
+        if not self.debriefing_waiter.dispatch():
+            self.window.tk.after(DEBRIEFING_DISPATCH_INTERVAL, self.dispatch_debriefing)
 
     def display(self):
         self.window.clear_right_pane()
@@ -107,8 +119,8 @@ class EventResultsMenu(Menu):
     def process_debriefing(self, debriefing: Debriefing):
         self.debriefing = debriefing
 
-        debriefing.calculate_units(regular_mission=self.event.operation.regular_mission,
-                                   quick_mission=self.event.operation.quick_mission,
+        debriefing.calculate_units(regular_manifest=self.event.operation.regular_manifest,
+                                   quick_manifest=self.event.operation.quick_manifest,
                                    player_name=self.game.player,
                                    enemy_name=self.game.enemy)
 
@@ -122,33 +134,12 @@ class EventResultsMenu(Menu):
 
     def simulate_result(self, player_factor: float, enemy_factor: float):
         def action():
-            debriefing = Debriefing({})
-
-            def count(country: Country) -> typing.Dict[UnitType, int]:
-                result = {}
-                for g in country.plane_group + country.vehicle_group + country.helicopter_group + country.ship_group:
-                    group = g  # type: Group
-                    for unit in group.units:
-                        unit_type = None
-                        if isinstance(unit, Vehicle):
-                            unit_type = vehicle_map[unit.type]
-                        elif isinstance(unit, Ship):
-                            unit_type = ship_map[unit.type]
-                        else:
-                            unit_type = unit.unit_type
-
-                        if unit_type in db.EXTRA_AA.values():
-                            continue
-
-                        result[unit_type] = result.get(unit_type, 0) + 1
-
-                return result
-
-            player = self.event.operation.mission.country(self.game.player)
-            enemy = self.event.operation.mission.country(self.game.enemy)
+            debriefing = Debriefing([], {})
+            manifest = self.event.operation.regular_manifest
+            categories = [MANIFEST_PLANE, MANIFEST_VEHICLE, MANIFEST_HELICOPTER, MANIFEST_SHIP]
 
-            alive_player_units = count(player)
-            alive_enemy_units = count(enemy)
+            alive_player_units = manifest.unit_counts(self.game.player, categories)
+            alive_enemy_units = manifest.unit_counts(self.game.enemy, categories)
 
             destroyed_player_units = db.unitdict_restrict_count(alive_player_units, math.ceil(
                 sum(alive_player_units.values()) * player_factor))
@@ -159,13 +150,13 @@ class EventResultsMenu(Menu):
             alive_enemy_units = {k: v - destroyed_enemy_units.get(k, 0) for k, v in alive_enemy_units.items()}
 
             debriefing.alive_units = {
-                enemy.name: alive_enemy_units,
-                player.name: alive_player_units,
+                self.game.enemy: alive_enemy_units,
+                self.game.player: alive_player_units,
             }
 
             debriefing.destroyed_units = {
-                player.name: destroyed_player_units,
-                enemy.name: destroyed_enemy_units,
+                self.game.player: destroyed_player_units,
+                self.game.enemy: destroyed_enemy_units,
             }
 
             self.finished = True
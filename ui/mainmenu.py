@@ -24,7 +24,9 @@ class MainMenu(Menu):
         self.frame.rowconfigure(1, weight=1)
 
     def display(self):
-        persistency.save_game(self.game)
+        if not persistency.save_game(self.game):
+            self.window.report_save_error()
+        self.window.report_history_error()
         self.window.clear_right_pane()
         self.upd.update()
 
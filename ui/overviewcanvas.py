@@ -305,8 +305,7 @@ class OverviewCanvas:
                         pygame.draw.line(surface, color, start_coords, end_coords, 4)
 
             if self.display_ground_targets.get():
-                for ground_object in cp.ground_objects:
-                    self.draw_ground_object(ground_object, surface, cp.captured, mouse_pos)
+                self.draw_ground_objects(cp, surface, mouse_pos)
 
         if self.display_bases.get():
             mouse_down = self.draw_bases(mouse_pos, mouse_down)
@@ -424,26 +423,44 @@ class OverviewCanvas:
         self.overlay.blit(title, (pos[0] + 4, 4 + pos[1]))
         self.overlay.blit(hint, (pos[0] + 4, 4 + pos[1] + title.get_height() + 5))
 
-    def draw_ground_object(self, ground_object: TheaterGroundObject, surface: pygame.Surface, captured: bool, mouse_pos):
-        if captured:
+    def draw_ground_objects(self, cp: ControlPoint, surface: pygame.Surface, mouse_pos):
+        if cp.captured:
             color = self._player_color()
         else:
             color = self._enemy_color()
 
-        x, y = self._transform_point(ground_object.position)
+        store_rows = cp.ground_object_store_rows()
+        if store_rows is None:
+            for ground_object in cp.ground_objects:
+                coords = self.draw_ground_object(ground_object.position, ground_object.category, ground_object.is_dead, surface, cp.captured, mouse_pos)
+                if coords:
+                    self.draw_ground_object_info(ground_object, coords, color, surface)
+            return
+
+        # markers are drawn from the store columns, ground object is only built for the hovered one
+        store, rows = store_rows
+        for row, position, category, is_dead in store.markers(rows):
+            coords = self.draw_ground_object(position, category, is_dead, surface, cp.captured, mouse_pos)
+            if coords:
+                self.draw_ground_object_info(store.object(row), coords, color, surface)
+
+    def draw_ground_object(self, position: Point, category: str, is_dead: bool, surface: pygame.Surface, captured: bool, mouse_pos) -> typing.Optional[typing.Tuple[int, int]]:
+        x, y = self._transform_point(position)
         rect = pygame.Rect(x, y, 16, 16)
 
-        if ground_object.is_dead or captured:
+        if is_dead or captured:
             surface.blit(self.ground_assets_icons["cleared"], (x, y))
         else:
-            if ground_object.category in self.ground_assets_icons.keys():
-                icon = self.ground_assets_icons[ground_object.category]
+            if category in self.ground_assets_icons.keys():
+                icon = self.ground_assets_icons[category]
             else:
                 icon = self.ground_assets_icons["target"]
             surface.blit(icon, (x, y))
 
         if rect.collidepoint(*mouse_pos):
-            self.draw_ground_object_info(ground_object, (x, y), color, surface)
+            return x, y
+
+        return None
 
     def draw_ground_object_info(self, ground_object: TheaterGroundObject, pos, color, surface: pygame.Surface):
         lb = self.font.render(str(ground_object), ANTIALIASING, color, BLACK)
@@ -4,8 +4,9 @@ from tkinter import messagebox
 
 from .styles import BG_COLOR,BG_TITLE_COLOR
 from game.game import *
+from game.rng import RandomService, STREAM_PLACEMENT
 from theater import persiangulf, nevada, caucasus, start_generator
-from userdata import logging as logging_module
+from userdata import logging as logging_module, persistency
 
 import sys
 import webbrowser
@@ -99,11 +100,13 @@ class Window:
             for i in range(0, int(len(conflicttheater.controlpoints) / 2)):
                 conflicttheater.controlpoints[i].captured = True
 
+        rng = RandomService()
         start_generator.generate_inital_units(conflicttheater, enemy_name, sams, multiplier)
-        start_generator.generate_groundobjects(conflicttheater)
+        start_generator.generate_groundobjects(conflicttheater, rng.stream(STREAM_PLACEMENT))
         game = Game(player_name=player_name,
                     enemy_name=enemy_name,
-                    theater=conflicttheater)
+                    theater=conflicttheater,
+                    rng=rng)
         game.budget = int(game.budget * multiplier)
         game.settings.multiplier = multiplier
         game.settings.sams = sams
@@ -136,7 +139,18 @@ class Window:
     def report_issue(self):
         raise logging_module.ShowLogsException()
 
+    def report_save_error(self):
+        messagebox.showerror("Save failed", "Campaign could not be saved: {}".format(persistency.last_save_error()))
+
+    def report_history_error(self):
+        error = persistency.take_history_error()
+        if error:
+            messagebox.showwarning("Save history", "Turn could not be recorded in the save history: {}".format(error))
+
     def exit(self):
+        if not persistency.flush_saves():
+            self.report_save_error()
+        self.report_history_error()
         self.tk.destroy()
         sys.exit(0)
 
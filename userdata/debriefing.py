@@ -2,10 +2,10 @@ import logging
 import typing
 import re
 import threading
-import time
+import queue
 import os
+import mmap
 
-from dcs.lua import parse
 from dcs.mission import Mission
 
 from dcs.unit import Vehicle, Ship
@@ -17,52 +17,160 @@ from dcs.unit import UnitType
 from game import db
 
 from .persistency import base_path
+from .directorywatcher import DirectoryWatcher
+from .luastream import LuaStreamParser
 from theater.theatergroundobject import CATEGORY_MAP
 
 DEBRIEFING_LOG_EXTENSION = "log"
 
+DEBRIEFING_EVENT = "event"
+DEBRIEFING_TRIGGERS_STATE = "triggers_state"
+DEBRIEFING_EVENT_FIELDS = ["type", "initiatorMissionID"]
 
-def parse_mutliplayer_debriefing(contents: str):
+
+MULTIPLAYER_DEBRIEFING_PATTERN = re.compile(rb"""
+    ^[ \t]*(?:
+        (?P<start>events[ ]=)
+      | (?P<stop>\}[ ]--[ ]end[ ]of[ ]events)
+      | (?P<end>\},[ ]--[ ]end[ ]of[ ]\[)
+      | (?P<key>initiator|initiatorMissionID|type)\t[^\n]*?=[ \t]*"(?P<value>[^\n]*?)",
+    )
+""", re.MULTILINE | re.VERBOSE)
+
+
+def parse_mutliplayer_debriefing(path: str):
     result = {}
     element = None
-
     in_events = False
 
-    for line in [x.strip() for x in contents.splitlines()]:
-        if line.startswith("events ="):
-            in_events = True
-        elif line.startswith("} -- end of events"):
-            in_events = False
-
-        if not in_events:
-            continue
-
-        key = None
-        if line.startswith("initiator\t"):
-            key = "initiator"
-            if element is None:
-                element = {}
-        elif line.startswith("initiatorMissionID\t"):
-            key = "initiatorMissionID"
-            if element is None:
-                element = {}
-        elif line.startswith("type\t"):
-            key = "type"
-            if element is None:
-                element = {}
-        elif line.startswith("}, -- end of ["):
-            result[len(result)] = element
-            element = None
-            continue
-        else:
-            continue
-
-        value = re.findall(r"=\s*\"(.*?)\",", line)[0]
-        element[key] = value
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return {"debriefing": {"events": result}}
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            for match in MULTIPLAYER_DEBRIEFING_PATTERN.finditer(buffer):
+                kind = match.lastgroup
+                if kind == "start":
+                    in_events = True
+                elif kind == "stop":
+                    in_events = False
+                elif not in_events:
+                    continue
+                elif kind == "end":
+                    result[len(result)] = element if element is not None else {}
+                    element = None
+                else:
+                    if element is None:
+                        element = {}
+                    element[match.group("key").decode()] = match.group("value").decode("utf-8", errors="replace")
 
     return {"debriefing": {"events": result}}
 
 
+def _read_debriefing_events(parser: LuaStreamParser):
+    for _ in parser.items():
+        event = {}
+        for field in parser.items():
+            if field in DEBRIEFING_EVENT_FIELDS:
+                event[field] = parser.value()
+            else:
+                parser.skip()
+
+        yield DEBRIEFING_EVENT, event
+
+
+def read_debriefing_log(path: str) -> typing.Iterator[typing.Tuple[str, typing.Any]]:
+    """
+    Streams (DEBRIEFING_EVENT, event) for every debriefing event, with only DEBRIEFING_EVENT_FIELDS kept,
+    and (DEBRIEFING_TRIGGERS_STATE, table) out of the log. Everything else is skipped without being built.
+    """
+    with open(path, "rb") as f:
+        parser = LuaStreamParser(f)
+        for name in parser.assignments():
+            if name == "debriefing":
+                for key in parser.items():
+                    if key == "events":
+                        yield from _read_debriefing_events(parser)
+                    elif key == DEBRIEFING_TRIGGERS_STATE:
+                        yield DEBRIEFING_TRIGGERS_STATE, parser.value()
+                    else:
+                        parser.skip()
+            elif name == "events":
+                # multiplayer logs keep events at the top level
+                yield from _read_debriefing_events(parser)
+            else:
+                parser.skip()
+
+
+MANIFEST_PLANE = "plane"
+MANIFEST_HELICOPTER = "helicopter"
+MANIFEST_VEHICLE = "vehicle"
+MANIFEST_SHIP = "ship"
+
+
+class MissionManifest:
+    """
+    Unit ids and types of a generated mission, which is everything the debriefing needs from it.
+    Kept instead of the mission itself, so the pydcs object graph could be released once the .miz is written.
+    """
+
+    units = None  # type: typing.Dict[str, typing.List[typing.Tuple[int, UnitType, str]]]
+    statics = None  # type: typing.Dict[str, typing.List[typing.Tuple[int, str]]]
+
+    _unit_index = None  # type: typing.Dict[int, typing.Tuple[str, UnitType]]
+    _static_index = None  # type: typing.Dict[int, typing.Tuple[str, str]]
+
+    def __init__(self, mission: Mission, country_names: typing.Collection[str]):
+        self.units = {}
+        self.statics = {}
+
+        for country_name in country_names:
+            country = mission.country(country_name)
+            units = []
+            for category, groups in [(MANIFEST_PLANE, country.plane_group),
+                                     (MANIFEST_HELICOPTER, country.helicopter_group),
+                                     (MANIFEST_VEHICLE, country.vehicle_group),
+                                     (MANIFEST_SHIP, country.ship_group)]:
+                for group in groups:
+                    for unit in group.units:
+                        units.append((unit.id, db.unit_type_of(unit), category))
+
+            self.units[country.name] = units
+            self.statics[country.name] = [(group.units[0].id, str(group.name)) for group in country.static_group]
+
+    @property
+    def unit_index(self) -> typing.Dict[int, typing.Tuple[str, UnitType]]:
+        # country name and type of every unit by its id, built on first use
+        if self._unit_index is None:
+            self._unit_index = {}
+            for country_name, units in self.units.items():
+                for unit_id, unit_type, _ in units:
+                    self._unit_index[unit_id] = country_name, unit_type
+
+        return self._unit_index
+
+    @property
+    def static_index(self) -> typing.Dict[int, typing.Tuple[str, str]]:
+        # country name and group name of every static by its id, built on first use
+        if self._static_index is None:
+            self._static_index = {}
+            for country_name, statics in self.statics.items():
+                for identifier, group_name in statics:
+                    self._static_index[identifier] = country_name, group_name
+
+        return self._static_index
+
+    def unit_counts(self, country_name: str, categories: typing.Collection[str]) -> typing.Dict[UnitType, int]:
+        result = {}
+        for _, unit_type, category in self.units.get(country_name, []):
+            if category not in categories or unit_type in db.EXTRA_AA.values():
+                continue
+
+            result[unit_type] = result.get(unit_type, 0) + 1
+
+        return result
+
+
 class Debriefing:
     def __init__(self, dead_units, trigger_state):
         self.destroyed_units = {}  # type: typing.Dict[str, typing.Dict[UnitType, int]]
@@ -70,11 +178,11 @@ class Debriefing:
         self.destroyed_objects = []  # type: typing.List[str]
 
         self._trigger_state = trigger_state
-        self._dead_units = dead_units
+        self._dead_units = set(dead_units)  # type: typing.Set[int]
 
     @classmethod
     def parse(cls, path: str):
-        dead_units = []
+        dead_units = set()
 
         def append_dead_object(object_mission_id_str):
             nonlocal dead_units
@@ -83,7 +191,7 @@ class Debriefing:
                 logging.error("debriefing: failed to append_dead_object {}: already exists!".format(object_mission_id))
                 return
 
-            dead_units.append(object_mission_id)
+            dead_units.add(object_mission_id)
 
         def parse_dead_object(event):
             try:
@@ -91,82 +199,64 @@ class Debriefing:
             except Exception as e:
                 logging.error(e)
 
-        with open(path, "r") as f:
-            table_string = f.read()
-            try:
-                table = parse.loads(table_string)
-            except Exception as e:
-                table = parse_mutliplayer_debriefing(table_string)
-
-            events = table.get("debriefing", {}).get("events", {})
-            for event in events.values():
-                event_type = event.get("type", None)
-                if event_type in ["crash", "dead"]:
-                    parse_dead_object(event)
-
-            trigger_state = table.get("debriefing", {}).get("triggers_state", {})
+        try:
+            events = []
+            trigger_state = {}
+            for kind, value in read_debriefing_log(path):
+                if kind == DEBRIEFING_EVENT:
+                    if value.get("type", None) in ["crash", "dead"]:
+                        events.append(value)
+                else:
+                    trigger_state = value
+        except ValueError as e:
+            logging.info("debriefing: {}, parsing as multiplayer debriefing".format(e))
+            table = parse_mutliplayer_debriefing(path)
+            events = [event for event in table["debriefing"]["events"].values() if event.get("type", None) in ["crash", "dead"]]
+            trigger_state = {}
+
+        for event in events:
+            parse_dead_object(event)
 
         return Debriefing(dead_units, trigger_state)
 
-    def calculate_units(self, regular_mission: Mission, quick_mission: Mission, player_name: str, enemy_name: str):
-        def count_groups(groups: typing.List[UnitType]) -> typing.Dict[UnitType, int]:
-            result = {}
-            for group in groups:
-                for unit in group.units:
-                    unit_type = db.unit_type_of(unit)
-                    if unit_type in db.EXTRA_AA.values():
-                        continue
-
-                    result[unit_type] = result.get(unit_type, 0) + 1
-
-            return result
+    def calculate_units(self, regular_manifest: MissionManifest, quick_manifest: MissionManifest, player_name: str, enemy_name: str):
+        manifest = regular_manifest if len(self._trigger_state) else quick_manifest
 
-        mission = regular_mission if len(self._trigger_state) else quick_mission
-
-        player = mission.country(player_name)
-        enemy = mission.country(enemy_name)
-        
-        player_units = count_groups(player.plane_group + player.vehicle_group + player.ship_group)
-        enemy_units = count_groups(enemy.plane_group + enemy.vehicle_group + enemy.ship_group)
+        player_units = manifest.unit_counts(player_name, [MANIFEST_PLANE, MANIFEST_VEHICLE, MANIFEST_SHIP])
+        enemy_units = manifest.unit_counts(enemy_name, [MANIFEST_PLANE, MANIFEST_VEHICLE, MANIFEST_SHIP])
 
         self.destroyed_units = {
-            player.name: {},
-            enemy.name: {},
-        }
-
-        all_groups = {
-            player.name: player.plane_group + player.helicopter_group + player.vehicle_group + player.ship_group,
-            enemy.name: enemy.plane_group + enemy.helicopter_group + enemy.vehicle_group + enemy.ship_group,
+            player_name: {},
+            enemy_name: {},
         }
 
-        static_groups = enemy.static_group
+        for unit_id in list(self._dead_units):
+            if unit_id in manifest.unit_index:
+                country_name, unit_type = manifest.unit_index[unit_id]
+                if country_name not in self.destroyed_units:
+                    continue
 
-        for country_name, country_groups in all_groups.items():
-            for group in country_groups:
-                for unit in group.units:
-                    if unit.id in self._dead_units:
-                        unit_type = db.unit_type_of(unit)
-                        logging.info("debriefing: found dead unit {} ({}, {})".format(str(unit.name), unit.id, unit_type))
+                logging.info("debriefing: found dead unit {} ({})".format(unit_id, unit_type))
 
-                        assert country_name
-                        assert unit_type
-                        self.destroyed_units[country_name][unit_type] = self.destroyed_units[country_name].get(unit_type, 0) + 1
-                        self._dead_units.remove(unit.id)
+                assert unit_type
+                self.destroyed_units[country_name][unit_type] = self.destroyed_units[country_name].get(unit_type, 0) + 1
+                self._dead_units.remove(unit_id)
+            elif unit_id in manifest.static_index:
+                country_name, group_name = manifest.static_index[unit_id]
+                if country_name != enemy_name:
+                    continue
 
-        for group in static_groups:
-            identifier = group.units[0].id
-            if identifier in self._dead_units:
-                logging.info("debriefing: found dead static {} ({})".format(str(group.name), identifier))
+                logging.info("debriefing: found dead static {} ({})".format(group_name, unit_id))
 
-                assert str(group.name)
-                self.destroyed_objects.append(str(group.name))
-                self._dead_units.remove(identifier)
+                assert group_name
+                self.destroyed_objects.append(group_name)
+                self._dead_units.remove(unit_id)
 
         logging.info("debriefing: unsatistied ids: {}".format(self._dead_units))
 
         self.alive_units = {
-            player.name: {k: v - self.destroyed_units[player.name].get(k, 0) for k, v in player_units.items()},
-            enemy.name: {k: v - self.destroyed_units[enemy.name].get(k, 0) for k, v in enemy_units.items()},
+            player_name: {k: v - self.destroyed_units[player_name].get(k, 0) for k, v in player_units.items()},
+            enemy_name: {k: v - self.destroyed_units[enemy_name].get(k, 0) for k, v in enemy_units.items()},
         }
 
 
@@ -174,31 +264,52 @@ def debriefing_directory_location() -> str:
     return os.path.join(base_path(), "liberation_debriefings")
 
 
-def _logfiles_snapshot() -> typing.Dict[str, float]:
-    result = {}
-    for file in os.listdir(debriefing_directory_location()):
-        fullpath = os.path.join(debriefing_directory_location(), file)
-        result[file] = os.path.getmtime(fullpath)
+class DebriefingWaiter:
+    """
+    Watches the debriefing directory on a background thread and parses the first debriefing log saved there.
+    Parsed debriefing is handed over through a queue, `dispatch` should be called periodically from the consumer
+    thread (the Tk loop) to run the callback there.
+    """
+
+    def __init__(self, callback: typing.Callable):
+        self.callback = callback
+        self.results = queue.Queue()  # type: queue.Queue
+        self.watcher = DirectoryWatcher(debriefing_directory_location())
+
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
 
-    return result
+    def _run(self):
+        while True:
+            path = self.watcher.wait_for_file()
+            if path is None:
+                return
+
+            try:
+                debriefing = Debriefing.parse(path)
+            except Exception as e:
+                logging.error("debriefing: failed to parse {}: {}".format(path, e))
+                continue
+
+            self.watcher.close()
+            self.results.put(debriefing)
+            return
 
+    def dispatch(self) -> bool:
+        try:
+            debriefing = self.results.get_nowait()
+        except queue.Empty:
+            return False
 
-def _poll_new_debriefing_log(snapshot: typing.Dict[str, float], callback: typing.Callable):
-    should_run = True
-    while should_run:
-        for file, timestamp in _logfiles_snapshot().items():
-            if file not in snapshot or timestamp != snapshot[file]:
-                debriefing = Debriefing.parse(os.path.join(debriefing_directory_location(), file))
-                callback(debriefing)
-                should_run = False
-                break
+        self.callback(debriefing)
+        return True
 
-        time.sleep(3)
+    def cancel(self):
+        self.watcher.close()
 
 
-def wait_for_debriefing(callback: typing.Callable):
+def wait_for_debriefing(callback: typing.Callable) -> DebriefingWaiter:
     if not os.path.exists(debriefing_directory_location()):
         os.mkdir(debriefing_directory_location())
 
-    threading.Thread(target=_poll_new_debriefing_log, args=(_logfiles_snapshot(), callback)).start()
-
+    return DebriefingWaiter(callback)
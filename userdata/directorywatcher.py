@@ -0,0 +1,190 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import selectors
+import struct
+import sys
+import threading
+import time
+import typing
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+INOTIFY_EVENT = struct.Struct("iIII")
+INOTIFY_READ_SIZE = 64 * 1024
+
+# interval of directory scans when inotify is not available
+POLL_INTERVAL = 1.0
+# file is considered complete once its size and mtime didn't change for this long
+SETTLE_TIME = 1.0
+SETTLE_CHECK_INTERVAL = 0.25
+# longest time the watcher blocks without checking whether it was closed
+MAX_WAIT = 1.0
+
+
+def _load_libc_inotify():
+    if not sys.platform.startswith("linux"):
+        return None
+
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class _InotifyBackend:
+    def __init__(self, libc, directory: str):
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.fd, selectors.EVENT_READ)
+
+    def changed_files(self, timeout: float) -> typing.Set[str]:
+        result = set()
+        if not self.selector.select(timeout):
+            return result
+
+        data = os.read(self.fd, INOTIFY_READ_SIZE)
+        offset = 0
+        while offset + INOTIFY_EVENT.size <= len(data):
+            _, _, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if name:
+                result.add(os.fsdecode(name))
+
+        return result
+
+    def close(self):
+        self.selector.close()
+        os.close(self.fd)
+
+
+class _PollingBackend:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.snapshot = self._scan()
+
+    def _scan(self) -> typing.Dict[str, typing.Tuple[float, int]]:
+        result = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    stat = entry.stat()
+                    result[entry.name] = stat.st_mtime, stat.st_size
+
+        return result
+
+    def changed_files(self, timeout: float) -> typing.Set[str]:
+        time.sleep(min(timeout, POLL_INTERVAL))
+        snapshot = self._scan()
+        changed = {name for name, state in snapshot.items() if self.snapshot.get(name) != state}
+        self.snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+
+class DirectoryWatcher:
+    """
+    Waits for files created or modified in `directory` after the watcher was created. Uses inotify when
+    available and falls back to polling otherwise. A file is reported only once it stopped changing for
+    `settle_time`, so writes still in progress are never picked up.
+    """
+
+    def __init__(self, directory: str, settle_time: float = SETTLE_TIME):
+        self.directory = directory
+        self.settle_time = settle_time
+        self._closed = False
+        self._waiting = False
+        self._backend_closed = False
+        self._lock = threading.Lock()
+
+        libc = _load_libc_inotify()
+        self.backend = None
+        if libc:
+            try:
+                self.backend = _InotifyBackend(libc, directory)
+            except OSError as e:
+                logging.warning("directory watcher: inotify unavailable ({}), polling instead".format(e))
+
+        if self.backend is None:
+            self.backend = _PollingBackend(directory)
+
+    @property
+    def is_polling(self) -> bool:
+        return isinstance(self.backend, _PollingBackend)
+
+    def _file_state(self, name: str) -> typing.Optional[typing.Tuple[float, int]]:
+        try:
+            stat = os.stat(os.path.join(self.directory, name))
+            return stat.st_mtime, stat.st_size
+        except OSError:
+            return None
+
+    def wait_for_file(self) -> typing.Optional[str]:
+        """
+        Blocks until a changed file settles and returns its path, or returns None once the watcher is closed.
+        """
+        with self._lock:
+            if self._closed:
+                return None
+            self._waiting = True
+
+        pending = {}  # type: typing.Dict[str, typing.Tuple[typing.Tuple[float, int], float]]
+        try:
+            while not self._closed:
+                timeout = SETTLE_CHECK_INTERVAL if pending else MAX_WAIT
+                changed = self.backend.changed_files(timeout)
+
+                now = time.monotonic()
+                for name in changed:
+                    pending[name] = self._file_state(name), now
+
+                for name, (state, changed_at) in list(pending.items()):
+                    current_state = self._file_state(name)
+                    if current_state is None or os.path.isdir(os.path.join(self.directory, name)):
+                        del pending[name]
+                    elif current_state != state:
+                        pending[name] = current_state, now
+                    elif now - changed_at >= self.settle_time:
+                        del pending[name]
+                        return os.path.join(self.directory, name)
+        finally:
+            with self._lock:
+                self._waiting = False
+                if self._closed:
+                    self._close_backend()
+
+        return None
+
+    def _close_backend(self):
+        if not self._backend_closed:
+            self._backend_closed = True
+            self.backend.close()
+
+    def close(self):
+        # while a wait is in progress the backend is closed by the waiting thread, so it's never closed under a
+        # blocking select; otherwise (e.g. after a file was returned) it's closed right away
+        with self._lock:
+            self._closed = True
+            if not self._waiting:
+                self._close_backend()
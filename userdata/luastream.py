@@ -0,0 +1,178 @@
+import re
+import typing
+
+# Streaming reader for lua tables as serialized by DCS (debriefing logs and the like). File is tokenized in fixed size
+# chunks, so memory stays constant regardless of its size, and callers walk the tables with `assignments`/`items`,
+# building values only for the parts they need and skipping the rest. Covers the subset written by the DCS serializer:
+# quoted strings, numbers, booleans, nil, nested tables and line comments. Tokens longer than a chunk (long strings
+# and comments) grow the buffer until they are complete.
+CHUNK_SIZE = 64 * 1024
+STRING_QUOTES = [b'"', b"'"]
+
+TOKEN_EOF = "eof"
+TOKEN_STRING = "string"
+TOKEN_NUMBER = "number"
+TOKEN_NAME = "name"
+TOKEN_SYMBOL = "symbol"
+
+TOKEN_PATTERN = re.compile(rb"""
+    (?P<space>\s+)
+  | (?P<comment>--[^\r\n]*)
+  | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+  | (?P<number>-?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<symbol>[{}\[\]=,;])
+""", re.VERBOSE | re.DOTALL)
+
+ESCAPE_PATTERN = re.compile(rb"\\(\d{1,3}|.)", re.DOTALL)
+ESCAPES = {
+    b"n": b"\n",
+    b"t": b"\t",
+    b"r": b"\r",
+    b"a": b"\a",
+    b"b": b"\b",
+    b"f": b"\f",
+    b"v": b"\v",
+}
+
+NAME_CONSTANTS = {
+    b"true": True,
+    b"false": False,
+    b"nil": None,
+}
+
+
+def tokenize(f: typing.BinaryIO) -> typing.Iterator[typing.Tuple[str, bytes]]:
+    buffer = b""
+    pos = 0
+    eof = False
+    while True:
+        match = TOKEN_PATTERN.match(buffer, pos)
+        if match is None and len(buffer) - pos >= CHUNK_SIZE and buffer[pos:pos + 1] not in STRING_QUOTES:
+            # a full chunk is buffered and still nothing matches, reading further won't help;
+            # unterminated string is the only token that doesn't match until it is read in full
+            raise ValueError("lua: unexpected {!r}".format(buffer[pos:pos + 32]))
+
+        if (match is None or match.end() == len(buffer)) and not eof:
+            # token could continue in the next chunk
+            chunk = f.read(CHUNK_SIZE)
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            eof = not chunk
+            continue
+
+        if match is None:
+            if pos == len(buffer):
+                return
+            raise ValueError("lua: unexpected {!r}".format(buffer[pos:pos + 32]))
+
+        pos = match.end()
+        kind = match.lastgroup
+        if kind in ["space", "comment"]:
+            continue
+
+        yield kind, match.group(kind)
+
+
+def _unescape(match) -> bytes:
+    escape = match.group(1)
+    if escape.isdigit():
+        return bytes([int(escape)])
+    return ESCAPES.get(escape, escape)
+
+
+def scalar_value(kind: str, token: bytes):
+    if kind == TOKEN_STRING:
+        return ESCAPE_PATTERN.sub(_unescape, token[1:-1]).decode("utf-8", errors="replace")
+    elif kind == TOKEN_NUMBER:
+        if token.isdigit() or (token[:1] == b"-" and token[1:].isdigit()):
+            return int(token)
+        return float(token)
+    elif kind == TOKEN_NAME and token in NAME_CONSTANTS:
+        return NAME_CONSTANTS[token]
+
+    raise ValueError("lua: expected value, got {!r}".format(token))
+
+
+class LuaStreamParser:
+    """
+    Pull parser over `tokenize`. Every key yielded by `assignments` and `items` should be followed by exactly one call
+    to `value`, `skip` or `items` consuming its value before the iteration continues.
+    """
+
+    def __init__(self, f: typing.BinaryIO):
+        self._tokens = tokenize(f)
+        self._pushback = []  # type: typing.List[typing.Tuple[str, bytes]]
+
+    def _next(self) -> typing.Tuple[str, bytes]:
+        if self._pushback:
+            return self._pushback.pop()
+        return next(self._tokens, (TOKEN_EOF, b""))
+
+    def _expect(self, symbol: bytes):
+        kind, token = self._next()
+        if kind != TOKEN_SYMBOL or token != symbol:
+            raise ValueError("lua: expected {!r}, got {!r}".format(symbol, token))
+
+    def assignments(self) -> typing.Iterator[str]:
+        while True:
+            kind, token = self._next()
+            if kind == TOKEN_EOF:
+                return
+            if kind != TOKEN_NAME:
+                raise ValueError("lua: expected global name, got {!r}".format(token))
+
+            self._expect(b"=")
+            yield token.decode()
+
+    def items(self) -> typing.Iterator[typing.Any]:
+        self._expect(b"{")
+        index = 1
+        while True:
+            kind, token = self._next()
+            if kind == TOKEN_SYMBOL and token == b"}":
+                return
+
+            if kind == TOKEN_SYMBOL and token == b"[":
+                key = scalar_value(*self._next())
+                self._expect(b"]")
+                self._expect(b"=")
+            elif kind == TOKEN_NAME and token not in NAME_CONSTANTS:
+                key = token.decode()
+                self._expect(b"=")
+            else:
+                self._pushback.append((kind, token))
+                key = index
+                index += 1
+
+            yield key
+
+            kind, token = self._next()
+            if kind != TOKEN_SYMBOL or token not in [b",", b";", b"}"]:
+                raise ValueError("lua: expected separator, got {!r}".format(token))
+            if token == b"}":
+                return
+
+    def value(self) -> typing.Any:
+        kind, token = self._next()
+        if kind == TOKEN_SYMBOL and token == b"{":
+            self._pushback.append((kind, token))
+            return {key: self.value() for key in self.items()}
+
+        return scalar_value(kind, token)
+
+    def skip(self):
+        kind, token = self._next()
+        if kind != TOKEN_SYMBOL or token != b"{":
+            scalar_value(kind, token)
+            return
+
+        depth = 1
+        while depth:
+            kind, token = self._next()
+            if kind == TOKEN_EOF:
+                raise ValueError("lua: unexpected end of table")
+            elif kind == TOKEN_SYMBOL and token == b"{":
+                depth += 1
+            elif kind == TOKEN_SYMBOL and token == b"}":
+                depth -= 1
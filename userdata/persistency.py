@@ -1,11 +1,21 @@
+import atexit
+import functools
 import logging
 import typing
-import pickle
 import os
 import sys
-import shutil
+
+from . import savefile, savejournal, savehistory
+from .savewriter import SaveWriter
 
 _user_folder = None  # type: str
+_save_writer = None  # type: SaveWriter
+_history_writer = None  # type: SaveWriter
+_save_journal = savejournal.SaveJournal()
+# (campaign id, turn) of the latest history entry recorded
+_history_key = None  # type: typing.Tuple[str, int]
+_save_error = None  # type: Exception
+_history_error = None  # type: Exception
 
 
 def setup(user_folder: str):
@@ -28,8 +38,17 @@ def _save_file() -> str:
     return os.path.join(base_path(), "liberation_save")
 
 
-def _temporary_save_file() -> str:
-    return os.path.join(base_path(), "liberation_save_tmp")
+def _journal_file() -> str:
+    return os.path.join(base_path(), "liberation_save_journal")
+
+
+def history_directory() -> str:
+    return os.path.join(base_path(), "liberation_history")
+
+
+def save_history(campaign_id: str) -> savehistory.SaveHistory:
+    # each campaign has its own history, so a new campaign never mixes with turns of the previous one
+    return savehistory.SaveHistory(os.path.join(history_directory(), campaign_id), _save_history_writer())
 
 
 def _save_file_exists() -> bool:
@@ -40,20 +59,142 @@ def mission_path_for(name: str) -> str:
     return os.path.join(base_path(), "Missions", "{}".format(name))
 
 
+def _writer() -> SaveWriter:
+    global _save_writer
+    if _save_writer is None:
+        _save_writer = SaveWriter()
+        atexit.register(flush_saves)
+
+    return _save_writer
+
+
+def _save_history_writer() -> SaveWriter:
+    # separate from the save writer, so failed history writes are told apart from failed saves
+    global _history_writer
+    if _history_writer is None:
+        _history_writer = SaveWriter()
+        atexit.register(_history_writer.flush)
+
+    return _history_writer
+
+
+def _collect_writer_error() -> bool:
+    global _save_error
+    error = _save_writer and _save_writer.take_error()
+    if error:
+        logging.error("persistency: background save failed: {}".format(error))
+        _save_error = error
+        return False
+
+    return True
+
+
+def last_save_error() -> typing.Optional[Exception]:
+    """
+    Error of the latest failed save. Failures of background writes are picked up by the next `save_game` or `flush_saves`.
+    """
+    return _save_error
+
+
+def take_history_error() -> typing.Optional[Exception]:
+    """
+    Error of the latest failed save history record since the last call. Failed history doesn't fail the save itself.
+    """
+    global _history_error
+    error = _history_writer and _history_writer.take_error()
+    if error:
+        logging.error("persistency: background history write failed: {}".format(error))
+        _history_error = error
+
+    error, _history_error = _history_error, None
+    return error
+
+
+def flush_saves(timeout: float = None) -> bool:
+    # history errors are left for take_history_error, only failed saves are reported here
+    if _history_writer is not None:
+        _history_writer.flush(timeout)
+
+    if _save_writer is None:
+        return True
+
+    flushed = _save_writer.flush(timeout)
+    return _collect_writer_error() and flushed
+
+
+def restore_header() -> typing.Optional[savefile.SaveHeader]:
+    flush_saves()
+    if not _save_file_exists():
+        return None
+
+    return savefile.header_of(_save_file())
+
+
 def restore_game():
+    flush_saves()
     if not _save_file_exists():
         return None
 
     with open(_save_file(), "rb") as f:
-        return pickle.load(f)
+        header = savefile.read_header(f)
+        game = savefile.loads_body(f.read())
+
+    _save_journal.reset()
+    journal = None if header.is_legacy else savejournal.read_journal(_journal_file(), header.timestamp)
+    if journal is not None:
+        deltas, is_complete = journal
+        savejournal.apply_delta(game, savejournal.merge_deltas(deltas))
+        logging.info("persistency: applied {} journal records".format(len(deltas)))
+
+        # journal with a truncated record can't be appended to, the next save writes a new snapshot instead
+        if is_complete and _is_incremental(game):
+            _save_journal.resume(game, header.timestamp, len(deltas), os.path.getsize(_journal_file()))
+
+    return game
+
+
+def _is_incremental(game) -> bool:
+    return getattr(game.settings, "incremental_saves", False)
+
+
+def _record_history(game):
+    global _history_key
+    # history keeps the first save of each turn of the campaign, which is the state the turn was started with
+    key = game.campaign_id, game.turn
+    if getattr(game.settings, "save_history", False) and key != _history_key:
+        save_history(game.campaign_id).record(game)
+        _history_key = key
 
 
 def save_game(game) -> bool:
+    # game is pickled on the calling thread, since it is mutated by the UI; compression and file I/O are done by the writer
+    global _save_error, _history_error
+    # failure of a previous background write is reported here, the current save is queued regardless
+    previous_saves_written = _collect_writer_error()
     try:
-        with open(_temporary_save_file(), "wb") as f:
-            pickle.dump(game, f)
-        shutil.copy(_temporary_save_file(), _save_file())
-        return True
+        if not _is_incremental(game):
+            _save_journal.reset()
+            header = savefile.SaveHeader.from_game(game, savefile.game_codec(game))
+            _writer().submit(_save_file(), savefile.pickle_game(game), functools.partial(savefile.encode, header))
+        elif _save_journal.needs_snapshot(game):
+            header, body, journal = _save_journal.snapshot(game)
+            # writer keeps submission order, so the new journal never lands next to the previous snapshot
+            _writer().submit(_save_file(), body, functools.partial(savefile.encode, header))
+            _writer().submit(_journal_file(), journal)
+        else:
+            record = _save_journal.record(game)
+            if record:
+                _writer().submit_append(_journal_file(), record)
     except Exception as e:
         logging.error(e)
+        _save_error = e
         return False
+
+    try:
+        _record_history(game)
+    except Exception as e:
+        # save itself is queued at this point, failed history is reported by take_history_error
+        logging.error("persistency: failed to record history: {}".format(e))
+        _history_error = e
+
+    return previous_saves_written
@@ -0,0 +1,161 @@
+import json
+import lzma
+import pickle
+import struct
+import time
+import typing
+import zlib
+
+SAVE_MAGIC = b"LIBSAVE\x00"
+SAVE_FORMAT_VERSION = 2
+
+CODEC_NONE = "none"
+CODEC_ZLIB = "zlib"
+CODEC_LZMA = "lzma"
+DEFAULT_CODEC = CODEC_ZLIB
+
+ZLIB_LEVEL = 6
+LZMA_PRESET = 6
+
+"""
+Body codecs: compress, decompress and the leading bytes used to detect the codec of a body.
+Pickle protocol 2+ bodies always start with the PROTO opcode.
+"""
+CODECS = {
+    CODEC_NONE: (lambda data: data, lambda data: data, b"\x80"),
+    CODEC_ZLIB: (lambda data: zlib.compress(data, ZLIB_LEVEL), zlib.decompress, b"\x78"),
+    CODEC_LZMA: (lambda data: lzma.compress(data, preset=LZMA_PRESET), lzma.decompress, b"\xfd7zXZ\x00"),
+}
+
+# magic, format version, length of the json header following it
+PREAMBLE = struct.Struct("<8sHI")
+
+
+class SaveHeader:
+    """
+    Campaign summary stored in front of the pickled game, so the save could be inspected without loading it.
+    Saves written before the container was introduced have `format_version` 0 and no summary.
+    """
+
+    format_version = 0  # type: int
+    game_version = None  # type: str
+    theater = None  # type: str
+    turn = 0  # type: int
+    budget = 0  # type: int
+    timestamp = 0.0  # type: float
+    codec = CODEC_NONE  # type: str
+    campaign_id = None  # type: str
+
+    def __init__(self, format_version: int = SAVE_FORMAT_VERSION, game_version: str = None, theater: str = None, turn: int = 0, budget: int = 0, timestamp: float = 0.0, codec: str = CODEC_NONE, campaign_id: str = None):
+        self.format_version = format_version
+        self.game_version = game_version
+        self.theater = theater
+        self.turn = turn
+        self.budget = budget
+        self.timestamp = timestamp
+        self.codec = codec
+        self.campaign_id = campaign_id
+
+    def __str__(self):
+        return "SaveHeader(v{} {} {} turn {} budget {})".format(self.format_version, self.game_version, self.theater, self.turn, self.budget)
+
+    @classmethod
+    def from_game(cls, game, codec: str = CODEC_NONE) -> "SaveHeader":
+        return cls(game_version=game.settings.version,
+                   theater=type(game.theater).__name__,
+                   turn=game.turn,
+                   budget=game.budget,
+                   timestamp=time.time(),
+                   codec=codec,
+                   campaign_id=getattr(game, "campaign_id", None))
+
+    @property
+    def is_legacy(self) -> bool:
+        return self.format_version == 0
+
+    def to_bytes(self) -> bytes:
+        payload = json.dumps({
+            "game_version": self.game_version,
+            "theater": self.theater,
+            "turn": self.turn,
+            "budget": self.budget,
+            "timestamp": self.timestamp,
+            "codec": self.codec,
+            "campaign_id": self.campaign_id,
+        }).encode("utf-8")
+        return PREAMBLE.pack(SAVE_MAGIC, self.format_version, len(payload)) + payload
+
+
+def read_header(f: typing.BinaryIO) -> SaveHeader:
+    """
+    Reads the header and leaves `f` positioned at the start of the pickled body.
+    Legacy saves are rewound to the beginning, since the whole file is the body.
+    """
+    preamble = f.read(PREAMBLE.size)
+    if len(preamble) < PREAMBLE.size or not preamble.startswith(SAVE_MAGIC):
+        f.seek(0)
+        return SaveHeader(format_version=0)
+
+    _, format_version, length = PREAMBLE.unpack(preamble)
+    if format_version > SAVE_FORMAT_VERSION:
+        raise ValueError("Unsupported save format version {}".format(format_version))
+
+    payload = json.loads(f.read(length).decode("utf-8"))
+    return SaveHeader(format_version=format_version,
+                      game_version=payload.get("game_version"),
+                      theater=payload.get("theater"),
+                      turn=payload.get("turn", 0),
+                      budget=payload.get("budget", 0),
+                      timestamp=payload.get("timestamp", 0.0),
+                      codec=payload.get("codec", CODEC_NONE),
+                      campaign_id=payload.get("campaign_id"))
+
+
+def detect_codec(body: bytes) -> str:
+    for codec, (_, _, magic) in CODECS.items():
+        if body.startswith(magic):
+            return codec
+
+    raise ValueError("Unknown save body encoding")
+
+
+def game_codec(game) -> str:
+    codec = getattr(game.settings, "save_compression", DEFAULT_CODEC)
+    return codec if codec in CODECS else DEFAULT_CODEC
+
+
+def pickle_game(game) -> bytes:
+    return pickle.dumps(game, pickle.HIGHEST_PROTOCOL)
+
+
+def encode(header: SaveHeader, body: bytes) -> bytes:
+    """
+    Save file contents of the pickled `body`. Compression is the slow part of the save, so it's kept apart
+    from pickling, which has to be done on the thread that owns the game.
+    """
+    compress, _, _ = CODECS[header.codec]
+    return header.to_bytes() + compress(body)
+
+
+def dumps(game, codec: str = None, header: SaveHeader = None) -> bytes:
+    header = header or SaveHeader.from_game(game, codec or game_codec(game))
+    return encode(header, pickle_game(game))
+
+
+def write(f: typing.BinaryIO, game, codec: str = None):
+    f.write(dumps(game, codec))
+
+
+def loads_body(body: bytes):
+    _, decompress, _ = CODECS[detect_codec(body)]
+    return pickle.loads(decompress(body))
+
+
+def read(f: typing.BinaryIO):
+    read_header(f)
+    return loads_body(f.read())
+
+
+def header_of(path: str) -> SaveHeader:
+    with open(path, "rb") as f:
+        return read_header(f)
@@ -0,0 +1,248 @@
+import hashlib
+import io
+import json
+import os
+import pickle
+import typing
+import zlib
+
+from . import savefile
+from .savewriter import SaveWriter, write_atomic
+
+HISTORY_FORMAT_VERSION = 1
+
+SECTION_SETTINGS = "settings"
+SECTION_GROUND_OBJECTS = "ground_objects"
+SECTION_BASE = "bases/{}"
+SECTION_THEATER = "theater"
+SECTION_GAME = "game"
+SECTION_EVENTS = "events"
+
+REFERENCE_GAME = "game"
+REFERENCE_THEATER = "theater"
+REFERENCE_SETTINGS = "settings"
+REFERENCE_EVENTS = "events"
+REFERENCE_STORE = "store"
+REFERENCE_CONTROLPOINT = "cp"
+REFERENCE_BASE = "base"
+REFERENCE_GROUND_OBJECT = "ground_object"
+
+
+class _SectionPickler(pickle.Pickler):
+    def __init__(self, file, references: typing.Dict[int, tuple], root):
+        super(_SectionPickler, self).__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.references = references
+        self.root = root
+
+    def persistent_id(self, obj):
+        if obj is self.root:
+            return None
+
+        return self.references.get(id(obj))
+
+
+class _SectionUnpickler(pickle.Unpickler):
+    def __init__(self, file, resolve: typing.Callable[[tuple], typing.Any]):
+        super(_SectionUnpickler, self).__init__(file)
+        self.resolve = resolve
+
+    def persistent_load(self, pid):
+        return self.resolve(pid)
+
+
+def split_sections(game) -> typing.Dict[str, bytes]:
+    """
+    Pickles the game as separate sections. Objects owned by another section are stored as references to it,
+    so sections that haven't changed produce the same bytes.
+    """
+    theater = game.theater
+    store = theater.ground_object_store
+
+    references = {
+        id(game): (REFERENCE_GAME, ),
+        id(theater): (REFERENCE_THEATER, ),
+        id(game.settings): (REFERENCE_SETTINGS, ),
+        id(game.events): (REFERENCE_EVENTS, ),
+        id(store): (REFERENCE_STORE, ),
+    }
+
+    for index, cp in enumerate(theater.controlpoints):
+        references[id(cp)] = (REFERENCE_CONTROLPOINT, index)
+        references[id(cp.base)] = (REFERENCE_BASE, index)
+
+    # ground objects are pickled as a part of the store section only
+    object_references = {id(x): (REFERENCE_GROUND_OBJECT, row) for row, x in store.materialized_objects()}
+
+    def dump(root, section_references) -> bytes:
+        f = io.BytesIO()
+        _SectionPickler(f, section_references, root).dump(root)
+        return f.getvalue()
+
+    all_references = references.copy()
+    all_references.update(object_references)
+    # control points are pickled as a part of the theater section
+    theater_references = {k: v for k, v in all_references.items() if v[0] != REFERENCE_CONTROLPOINT}
+    sections = {
+        SECTION_SETTINGS: dump(game.settings, all_references),
+        SECTION_GROUND_OBJECTS: dump(store, references),
+        SECTION_THEATER: dump(theater, theater_references),
+        SECTION_GAME: dump(game, all_references),
+        SECTION_EVENTS: dump(game.events, all_references),
+    }
+
+    for index, cp in enumerate(theater.controlpoints):
+        sections[SECTION_BASE.format(index)] = dump(cp.base, all_references)
+
+    return sections
+
+
+def join_sections(sections: typing.Dict[str, bytes]):
+    loaded = {}  # type: typing.Dict[tuple, typing.Any]
+
+    def resolve(pid):
+        pid = tuple(pid)
+        if pid[0] == REFERENCE_CONTROLPOINT:
+            return loaded[(REFERENCE_THEATER, )].controlpoints[pid[1]]
+        elif pid[0] == REFERENCE_GROUND_OBJECT:
+            return loaded[(REFERENCE_STORE, )].object(pid[1])
+        else:
+            return loaded[pid]
+
+    def load(section: str):
+        return _SectionUnpickler(io.BytesIO(sections[section]), resolve).load()
+
+    # sections are loaded in dependency order, game and its events reference each other,
+    # so events are loaded into the list object the game section refers to
+    loaded[(REFERENCE_SETTINGS, )] = load(SECTION_SETTINGS)
+    loaded[(REFERENCE_STORE, )] = load(SECTION_GROUND_OBJECTS)
+
+    index = 0
+    while SECTION_BASE.format(index) in sections:
+        loaded[(REFERENCE_BASE, index)] = load(SECTION_BASE.format(index))
+        index += 1
+
+    loaded[(REFERENCE_EVENTS, )] = events = []
+    loaded[(REFERENCE_THEATER, )] = load(SECTION_THEATER)
+    loaded[(REFERENCE_GAME, )] = game = load(SECTION_GAME)
+    events.extend(load(SECTION_EVENTS))
+    return game
+
+
+class HistoryEntry:
+    turn = 0  # type: int
+    header = None  # type: savefile.SaveHeader
+    sections = None  # type: typing.Dict[str, str]
+
+    def __init__(self, turn: int, header: savefile.SaveHeader, sections: typing.Dict[str, str]):
+        self.turn = turn
+        self.header = header
+        self.sections = sections
+
+    def __str__(self):
+        return "Turn {} ({}, budget {})".format(self.turn, self.header.theater, self.header.budget)
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "format_version": HISTORY_FORMAT_VERSION,
+            "turn": self.turn,
+            "game_version": self.header.game_version,
+            "theater": self.header.theater,
+            "budget": self.header.budget,
+            "timestamp": self.header.timestamp,
+            "campaign_id": self.header.campaign_id,
+            "sections": self.sections,
+        }, indent=1, sort_keys=True)
+
+    @classmethod
+    def from_json(cls, contents: str) -> "HistoryEntry":
+        data = json.loads(contents)
+        header = savefile.SaveHeader(game_version=data["game_version"],
+                                     theater=data["theater"],
+                                     turn=data["turn"],
+                                     budget=data["budget"],
+                                     timestamp=data["timestamp"],
+                                     campaign_id=data.get("campaign_id"))
+        return cls(data["turn"], header, data["sections"])
+
+
+class SaveHistory:
+    """
+    Content-addressed store of per-turn saves of a single campaign. Every save is split into sections, which are
+    stored once per unique content under their sha256, so the history grows only with what changed between turns.
+    """
+
+    def __init__(self, directory: str, writer: SaveWriter = None):
+        self.directory = directory
+        self.writer = writer
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "objects", digest[:2], digest)
+
+    def _entry_path(self, turn: int) -> str:
+        return os.path.join(self.directory, "turns", "{:05}.json".format(turn))
+
+    def _write(self, path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if self.writer:
+            self.writer.submit(path, data)
+        else:
+            write_atomic(path, data)
+
+    def record(self, game) -> HistoryEntry:
+        """
+        Stores the current state of the game as the entry of the current turn, replacing the previous one for that turn.
+        Pickles the game once more on the calling thread, on top of the save itself.
+        """
+        # objects are submitted before the entry referencing them, and the writer keeps submission order,
+        # so an entry is never on disk without its objects
+        sections = {}
+        for name, data in split_sections(game).items():
+            digest = hashlib.sha256(data).hexdigest()
+            sections[name] = digest
+            if not os.path.exists(self._object_path(digest)):
+                self._write(self._object_path(digest), zlib.compress(data))
+
+        entry = HistoryEntry(game.turn, savefile.SaveHeader.from_game(game), sections)
+        self._write(self._entry_path(game.turn), entry.to_json().encode("utf-8"))
+        return entry
+
+    def entries(self) -> typing.List[HistoryEntry]:
+        directory = os.path.join(self.directory, "turns")
+        if not os.path.exists(directory):
+            return []
+
+        result = []
+        for file in sorted(os.listdir(directory)):
+            if file.endswith(".json"):
+                with open(os.path.join(directory, file), "r") as f:
+                    result.append(HistoryEntry.from_json(f.read()))
+
+        return result
+
+    def entry(self, turn: int) -> typing.Optional[HistoryEntry]:
+        if not os.path.exists(self._entry_path(turn)):
+            return None
+
+        with open(self._entry_path(turn), "r") as f:
+            return HistoryEntry.from_json(f.read())
+
+    def restore(self, turn: int):
+        """
+        Loads the game as it was at `turn`. Like loading a save, it returns a separate game and leaves the current one untouched.
+        """
+        entry = self.entry(turn)
+        assert entry, "No history for turn {}".format(turn)
+
+        sections = {}
+        for name, digest in entry.sections.items():
+            with open(self._object_path(digest), "rb") as f:
+                sections[name] = zlib.decompress(f.read())
+
+        return join_sections(sections)
+
+    def disk_usage(self) -> int:
+        total = 0
+        for path, _, files in os.walk(self.directory):
+            total += sum(os.path.getsize(os.path.join(path, x)) for x in files)
+
+        return total
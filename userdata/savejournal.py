@@ -0,0 +1,214 @@
+import array
+import os
+import pickle
+import struct
+import typing
+import zlib
+
+from . import savefile
+
+JOURNAL_MAGIC = b"LIBJRNL\x00"
+
+# journal is compacted into a new snapshot after this many records or bytes
+JOURNAL_MAX_ENTRIES = 64
+JOURNAL_MAX_BYTES = 256 * 1024
+
+# magic, timestamp of the snapshot header the journal applies to
+JOURNAL_PREAMBLE = struct.Struct("<8sd")
+RECORD_LENGTH = struct.Struct("<I")
+
+"""
+Campaign state sections tracked by the journal. Everything else is only changed when a turn passes,
+which always produces a new snapshot.
+"""
+SECTION_BUDGET = "budget"
+SECTION_SETTINGS = "settings"
+SECTION_RNG = "rng"
+SECTION_CONTROLPOINTS = "controlpoints"
+SECTION_DEAD_OBJECTS = "dead_objects"
+SECTION_DELIVERIES = "deliveries"
+# unit catalog names the inventories of each control point in the delta were written with, by control point index
+SECTION_CATALOG = "catalog"
+
+
+def campaign_state(game) -> typing.Dict[str, typing.Any]:
+    from game.event import UnitsDeliveryEvent
+
+    controlpoints = game.theater.controlpoints
+    return {
+        SECTION_BUDGET: game.budget,
+        SECTION_SETTINGS: dict(game.settings.__dict__),
+        SECTION_RNG: {name: game.rng.stream(name).getstate() for name in game.rng.stream_names},
+        SECTION_CONTROLPOINTS: {
+            index: (cp.captured, cp.base.strength, cp.base.inventory_array().tobytes(), dict(cp.base.commision_points))
+            for index, cp in enumerate(controlpoints)
+        },
+        SECTION_DEAD_OBJECTS: frozenset(x for _, x in game.theater.ground_object_identifiers(alive=False)),
+        SECTION_DELIVERIES: [(controlpoints.index(x.to_cp), dict(x.units)) for x in game.events if isinstance(x, UnitsDeliveryEvent)],
+    }
+
+
+def state_delta(previous: typing.Dict[str, typing.Any], current: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+    delta = {}
+    for section, value in current.items():
+        if previous.get(section) == value:
+            continue
+
+        if section == SECTION_CONTROLPOINTS:
+            # only the bases that changed
+            previous_cps = previous.get(section, {})
+            delta[section] = {index: cp for index, cp in value.items() if previous_cps.get(index) != cp}
+        elif section == SECTION_DEAD_OBJECTS:
+            delta[section] = value - previous.get(section, frozenset())
+        else:
+            delta[section] = value
+
+    return delta
+
+
+def merge_deltas(deltas: typing.Iterable[typing.Dict[str, typing.Any]]) -> typing.Dict[str, typing.Any]:
+    result = {}
+    for delta in deltas:
+        for section, value in delta.items():
+            if section in [SECTION_CONTROLPOINTS, SECTION_CATALOG]:
+                result.setdefault(section, {}).update(value)
+            elif section == SECTION_DEAD_OBJECTS:
+                result[section] = result.get(section, frozenset()) | value
+            else:
+                result[section] = value
+
+    return result
+
+
+def apply_delta(game, delta: typing.Dict[str, typing.Any]):
+    from game.event import UnitsDeliveryEvent
+    import theater.base
+
+    if SECTION_BUDGET in delta:
+        game.budget = delta[SECTION_BUDGET]
+
+    if SECTION_SETTINGS in delta:
+        game.settings.__dict__.update(delta[SECTION_SETTINGS])
+
+    for name, state in delta.get(SECTION_RNG, {}).items():
+        game.rng.stream(name).setstate(state)
+
+    controlpoints = game.theater.controlpoints
+    catalogs = delta.get(SECTION_CATALOG, {})
+    for index, (captured, strength, inventory, commision_points) in delta.get(SECTION_CONTROLPOINTS, {}).items():
+        cp = controlpoints[index]
+        cp.captured = captured
+        cp.base.strength = strength
+        cp.base.commision_points = dict(commision_points)
+        # journals written before catalog names were recorded use the current catalog
+        cp.base.load_inventory_array(array.array(theater.base.INVENTORY_TYPECODE, inventory), catalogs.get(index))
+
+    for string_identifier in delta.get(SECTION_DEAD_OBJECTS, []):
+        for ground_object in game.theater.find_ground_objects(string_identifier):
+            game.theater.kill_ground_object(ground_object)
+
+    if SECTION_DELIVERIES in delta:
+        game.events = [x for x in game.events if not isinstance(x, UnitsDeliveryEvent)]
+        for index, units in delta[SECTION_DELIVERIES]:
+            game.units_delivery_event(controlpoints[index]).units = dict(units)
+
+
+def encode_record(delta: typing.Dict[str, typing.Any]) -> bytes:
+    data = zlib.compress(pickle.dumps(delta, pickle.HIGHEST_PROTOCOL))
+    return RECORD_LENGTH.pack(len(data)) + data
+
+
+def read_journal(path: str, snapshot_timestamp: float) -> typing.Optional[typing.Tuple[typing.List[typing.Dict[str, typing.Any]], bool]]:
+    """
+    Returns deltas of the journal at `path` and whether it was read to the end, or None if there is no journal
+    written on top of the snapshot with `snapshot_timestamp`. A record truncated by an interrupted write ends the journal.
+    """
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if len(data) < JOURNAL_PREAMBLE.size:
+        return None
+
+    magic, timestamp = JOURNAL_PREAMBLE.unpack_from(data)
+    if magic != JOURNAL_MAGIC or timestamp != snapshot_timestamp:
+        return None
+
+    deltas = []
+    offset = JOURNAL_PREAMBLE.size
+    while offset + RECORD_LENGTH.size <= len(data):
+        length, = RECORD_LENGTH.unpack_from(data, offset)
+        offset += RECORD_LENGTH.size
+        if offset + length > len(data):
+            break
+
+        deltas.append(pickle.loads(zlib.decompress(data[offset:offset + length])))
+        offset += length
+
+    return deltas, offset == len(data)
+
+
+class SaveJournal:
+    """
+    Incremental saves: a full snapshot followed by an append-only journal of campaign state deltas.
+    A new snapshot is written on the first save, whenever a turn passes and when the journal grows
+    over `JOURNAL_MAX_ENTRIES` records or `JOURNAL_MAX_BYTES` bytes.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.snapshot_timestamp = None  # type: float
+        self.turn = None  # type: int
+        self.state = None  # type: typing.Dict[str, typing.Any]
+        self.entries = 0
+        self.size = 0
+
+    def resume(self, game, snapshot_timestamp: float, entries: int, size: int):
+        self.snapshot_timestamp = snapshot_timestamp
+        self.turn = game.turn
+        self.state = campaign_state(game)
+        self.entries = entries
+        self.size = size
+
+    def needs_snapshot(self, game) -> bool:
+        return self.state is None or \
+               game.turn != self.turn or \
+               self.entries >= JOURNAL_MAX_ENTRIES or \
+               self.size >= JOURNAL_MAX_BYTES
+
+    def snapshot(self, game, codec: str = None) -> typing.Tuple[savefile.SaveHeader, bytes, bytes]:
+        """
+        Returns header and pickled body of the snapshot, and contents of the new, empty, journal.
+        Body is left for `savefile.encode` to compress, so it could be done off the calling thread.
+        """
+        header = savefile.SaveHeader.from_game(game, codec or savefile.game_codec(game))
+        body = savefile.pickle_game(game)
+        journal = JOURNAL_PREAMBLE.pack(JOURNAL_MAGIC, header.timestamp)
+
+        self.resume(game, header.timestamp, 0, len(journal))
+        return header, body, journal
+
+    def record(self, game) -> typing.Optional[bytes]:
+        """
+        Returns the journal record with changes since the last save, or None if nothing tracked has changed.
+        """
+        from game import db
+
+        state = campaign_state(game)
+        delta = state_delta(self.state, state)
+        self.state = state
+        if not delta:
+            return None
+
+        if SECTION_CONTROLPOINTS in delta:
+            # same as full saves, so the inventories are replayed correctly after the unit catalog changes
+            delta[SECTION_CATALOG] = {index: db.UNIT_CATALOG_NAMES for index in delta[SECTION_CONTROLPOINTS]}
+
+        record = encode_record(delta)
+        self.entries += 1
+        self.size += len(record)
+        return record
@@ -0,0 +1,119 @@
+import logging
+import os
+import threading
+import typing
+
+
+class SaveWriter:
+    """
+    Background writer of save files. Requests submitted while a write is in progress are coalesced,
+    only the latest data for each path gets written. Replacement data can be submitted with an `encode`
+    function (e.g. compression), which is run on the writer thread, so coalesced requests are never encoded.
+    Files are written to a temporary file, synced and then atomically moved over the destination. Appends
+    are written in order after the latest replacement of the file, if any.
+
+    Files are written in the order they were submitted in: a replacement moves the path to the end of the queue,
+    appends keep the position of the pending request they are added to. Callers rely on this to write a file
+    before the files referencing it (the save before its journal, history objects before the entry).
+
+    Failed writes are logged and kept in `last_error` until `take_error` reports them.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        # path -> (replacement contents or None, function encoding them or None, data appended after it)
+        self._pending = {}  # type: typing.Dict[str, typing.Tuple[typing.Optional[bytes], typing.Optional[typing.Callable[[bytes], bytes]], typing.List[bytes]]]
+        self._writing = False
+        self._closed = False
+        self.last_error = None  # type: Exception
+
+        self._thread = threading.Thread(target=self._run, name="SaveWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, path: str, data: bytes, encode: typing.Callable[[bytes], bytes] = None):
+        with self._condition:
+            assert not self._closed
+            self._pending.pop(path, None)
+            self._pending[path] = data, encode, []
+            self._condition.notify_all()
+
+    def submit_append(self, path: str, data: bytes):
+        with self._condition:
+            assert not self._closed
+            self._pending.setdefault(path, (None, None, []))[2].append(data)
+            self._condition.notify_all()
+
+    def take_error(self) -> typing.Optional[Exception]:
+        with self._condition:
+            error, self.last_error = self.last_error, None
+            return error
+
+    @property
+    def is_idle(self) -> bool:
+        with self._condition:
+            return not self._pending and not self._writing
+
+    def flush(self, timeout: float = None) -> bool:
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._writing, timeout)
+
+    def close(self, timeout: float = None) -> bool:
+        flushed = self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+        return flushed
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+
+                path = next(iter(self._pending))
+                data, encode, appended = self._pending.pop(path)
+                self._writing = True
+
+            error = None
+            try:
+                if data is None:
+                    append_durable(path, b"".join(appended))
+                else:
+                    if encode is not None:
+                        data = encode(data)
+                    write_atomic(path, data + b"".join(appended))
+            except Exception as e:
+                logging.exception(e)
+                error = e
+            finally:
+                with self._condition:
+                    if error is not None:
+                        self.last_error = error
+                    self._writing = False
+                    self._condition.notify_all()
+
+
+def append_durable(path: str, data: bytes):
+    with open(path, "ab") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def write_atomic(path: str, data: bytes):
+    temporary_path = path + "_tmp"
+    with open(temporary_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(temporary_path, path)
+    if hasattr(os, "O_DIRECTORY"):
+        # persist the rename itself; not available (nor needed) on windows
+        directory = os.open(os.path.dirname(path) or ".", os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)